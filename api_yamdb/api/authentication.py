@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from api.constants import USER_CACHE_KEY, USER_CACHE_TIMEOUT
+from api.timing import AUTH, measure
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация с кэшированием пользователя.
+
+    Читающие запросы берут пользователя из кэша по id из токена и не
+    обращаются к таблице пользователей. Кэш у каждого процесса свой, а
+    сигналы сбрасывают запись только в процессе, изменившем
+    пользователя, поэтому таймаут короткий. Изменяющие запросы всегда
+    читают пользователя из БД: сохранение устаревшей копии затёрло бы
+    изменения из других процессов, например смену роли.
+    """
+
+    def authenticate(self, request):
+        with measure(AUTH):
+            header = self.get_header(request)
+            if header is None:
+                return None
+            raw_token = self.get_raw_token(header)
+            if raw_token is None:
+                return None
+            validated_token = self.get_validated_token(raw_token)
+            user = self.get_user(
+                validated_token, use_cache=request.method in SAFE_METHODS
+            )
+            return user, validated_token
+
+    def get_user(self, validated_token, use_cache=True):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        key = USER_CACHE_KEY.format(user_id=user_id)
+        user = cache.get(key) if use_cache else None
+        if user is None:
+            # Проверки существования, активности и отзыва токена
+            # выполняет родительский класс.
+            user = super().get_user(validated_token)
+            cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user
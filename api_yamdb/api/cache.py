@@ -0,0 +1,149 @@
+import hashlib
+from contextvars import ContextVar
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from reviews.models import CatalogVersion
+
+RESPONSE_KEY = 'catalog:response:{resource}:{version}:{digest}'
+COUNT_KEY = 'catalog:count:{resource}:{version}'
+STATS_KEY = 'catalog:stats:{name}'
+HIT = 'hit'
+MISS = 'miss'
+# Версии всех ресурсов читаются из БД одним запросом.
+RESOURCES = ('categories', 'comments', 'genres', 'titles', 'users')
+
+# Версии, прочитанные в текущем запросе (см. CatalogVersionMiddleware).
+current_versions = ContextVar('catalog_versions', default=None)
+# Ресурсы, версии которых повысятся после фиксации транзакции.
+pending_versions = ContextVar('pending_catalog_versions', default=None)
+
+
+def get_catalog_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def new_version():
+    # Каждая запись получает новое случайное значение, а не +1: версии
+    # из разных процессов не совпадут, и атомарный incr не нужен.
+    return uuid4().hex
+
+
+def load_versions(resources):
+    def select():
+        return dict(
+            CatalogVersion.objects.filter(resource__in=resources).values_list(
+                'resource', 'version'
+            )
+        )
+
+    versions = select()
+    missing = set(resources) - versions.keys()
+    if missing:
+        CatalogVersion.objects.bulk_create(
+            (
+                CatalogVersion(resource=resource, version=new_version())
+                for resource in missing
+            ),
+            ignore_conflicts=True,
+        )
+        versions = select()
+    return versions
+
+
+def get_version(resource):
+    """Версия ресурса, общая для всех процессов.
+
+    Внутри запроса версии читаются один раз и запоминаются до конца
+    запроса.
+    """
+    versions = current_versions.get()
+    if versions is None:
+        return load_versions([resource])[resource]
+    if resource not in versions:
+        versions.update(load_versions({resource, *RESOURCES}))
+    return versions[resource]
+
+
+def write_pending_versions():
+    resources = pending_versions.get()
+    if not resources:
+        return
+    # Одна версия на все ресурсы: одним UPDATE, и всё равно уникальна.
+    version = new_version()
+    updated = CatalogVersion.objects.filter(resource__in=resources).update(
+        version=version
+    )
+    if updated < len(resources):
+        CatalogVersion.objects.bulk_create(
+            (
+                CatalogVersion(resource=resource, version=version)
+                for resource in resources
+            ),
+            ignore_conflicts=True,
+        )
+    current = current_versions.get()
+    if current is not None:
+        current.update(dict.fromkeys(resources, version))
+    resources.clear()
+
+
+def bump_version(*resources):
+    """Меняет версии ресурсов после фиксации текущей транзакции.
+
+    Версия, сменённая до фиксации, позволила бы параллельному запросу
+    закэшировать старые данные уже под новой версией. Повторные вызовы
+    в одной транзакции записывают версии один раз.
+    """
+    pending = pending_versions.get()
+    if pending is None:
+        pending = set()
+        pending_versions.set(pending)
+    pending.update(resources)
+    transaction.on_commit(write_pending_versions)
+
+
+def get_response_key(resource, url):
+    # В закэшированных данных абсолютные ссылки next/previous, поэтому
+    # ключ строится по полному URL со схемой и хостом, а не по пути.
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return RESPONSE_KEY.format(
+        resource=resource, version=get_version(resource), digest=digest
+    )
+
+
+def get_cached_count(resource, queryset):
+    """Число строк ресурса, закэшированное до следующей записи в него."""
+    cache = get_catalog_cache()
+    key = COUNT_KEY.format(resource=resource, version=get_version(resource))
+    count = cache.get(key)
+    if count is None:
+        count = queryset.order_by().count()
+        cache.set(key, count)
+    return count
+
+
+def record(name):
+    cache = get_catalog_cache()
+    key = STATS_KEY.format(name=name)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def get_cache_stats():
+    """Счётчики попаданий и промахов кэша каталога.
+
+    Счётчики лежат в кэше каталога, поэтому при LocMemCache они свои у
+    каждого процесса.
+    """
+    cache = get_catalog_cache()
+    return {
+        name: cache.get(STATS_KEY.format(name=name), 0)
+        for name in (HIT, MISS)
+    }
@@ -1,2 +1,7 @@
 EMAIL_SUBJECT = 'Код регистрации'
 EMAIL_CONFIRM = 'yamdb.host@yandex.ru'
+
+USER_CACHE_KEY = 'auth:user:{user_id}'
+# Кэш пользователей у каждого процесса свой: смена роли в другом
+# процессе видна читающим запросам не позже чем через столько секунд.
+USER_CACHE_TIMEOUT = 5
@@ -0,0 +1,120 @@
+from django.db import DEFAULT_DB_ALIAS, connection
+
+from api.cache import get_version
+from reviews.models import Category, Genre
+
+
+class DimensionSnapshot:
+    """Снимок справочника: id, slug и name всех строк таблицы."""
+
+    fields = ('id', 'name', 'slug')
+
+    def __init__(self, model, version):
+        self.model = model
+        self.version = version
+        self.rows = {
+            pk: (name, slug)
+            for pk, name, slug in model.objects.values_list(*self.fields)
+        }
+        self.pks = {slug: pk for pk, (_, slug) in self.rows.items()}
+
+    def get_pk(self, slug):
+        return self.pks.get(slug)
+
+    def get_data(self, pk):
+        """Представление {'name': ..., 'slug': ...} или None."""
+        row = self.rows.get(pk)
+        if row is None:
+            return None
+        return {'name': row[0], 'slug': row[1]}
+
+    def get_object(self, slug):
+        """Экземпляр модели без запроса к БД или None."""
+        pk = self.pks.get(slug)
+        if pk is None:
+            return None
+        return self.model.from_db(
+            DEFAULT_DB_ALIAS, self.fields, (pk, *self.rows[pk])
+        )
+
+
+class DimensionCache:
+    """Справочник в памяти процесса.
+
+    Снимок таблицы перечитывается, когда меняется версия ресурса в кэше
+    каталога: её повышают сигналы при любой записи. Пока новая версия
+    не видна, строки, которых нет в снимке, ищутся в БД.
+    """
+
+    def __init__(self, model, resource):
+        self.model = model
+        self.resource = resource
+        self.snapshot = None
+
+    def get_snapshot(self, pks=()):
+        """Снимок справочника.
+
+        Если в снимке нет строк pks, на которые уже ссылаются
+        произведения, снимок устарел и перечитывается, не дожидаясь
+        новой версии.
+        """
+        # Версия читается до строк: запись, случившаяся во время
+        # загрузки, сменит версию, и снимок перечитается.
+        version = get_version(self.resource)
+        snapshot = self.snapshot
+        if (
+            snapshot is not None
+            and snapshot.version == version
+            and snapshot.rows.keys() >= set(pks)
+        ):
+            return snapshot
+        return self.load(version)
+
+    def load(self, version):
+        snapshot = DimensionSnapshot(self.model, version)
+        # Внутри транзакции снимок может увидеть строки, которые потом
+        # откатятся, поэтому сохраняется только прочитанный вне неё.
+        if not connection.in_atomic_block:
+            self.snapshot = snapshot
+        return snapshot
+
+    def get_pk(self, slug):
+        """id по slug или None.
+
+        Slug, которого нет в снимке, проверяется в БД: если строка
+        есть, снимок перечитывается.
+        """
+        pk = self.get_snapshot().get_pk(slug)
+        if pk is None and self.model.objects.filter(slug=slug).exists():
+            pk = self.load(get_version(self.resource)).get_pk(slug)
+        return pk
+
+    def get_objects(self, slugs):
+        """Объекты по slug одним проходом: {slug: объект}.
+
+        Slug, которых нет в снимке, добираются из БД одним запросом
+        slug__in; если какие-то из них нашлись, снимок перечитывается.
+        Неизвестных slug в результате нет.
+        """
+        snapshot = self.get_snapshot()
+        objects, missing = {}, []
+        for slug in set(slugs):
+            instance = snapshot.get_object(slug)
+            if instance is None:
+                missing.append(slug)
+            else:
+                objects[slug] = instance
+        if missing:
+            found = {
+                instance.slug: instance
+                for instance in self.model.objects.filter(slug__in=missing)
+            }
+            if found:
+                self.load(get_version(self.resource))
+            objects.update(found)
+        return objects
+
+
+categories = DimensionCache(Category, 'categories')
+genres = DimensionCache(Genre, 'genres')
+DIMENSIONS = {Category: categories, Genre: genres}
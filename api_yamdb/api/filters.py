@@ -1,13 +1,32 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
 from django_filters.rest_framework import CharFilter, FilterSet, NumberFilter
 
+from api import dimensions
 from reviews.models import Title
 
+SEARCH_TOKEN = re.compile(r'\w+')
+
+
+def build_fts_query(value):
+    """Превращает пользовательскую строку в безопасный запрос FTS5.
+
+    Каждое слово берётся в кавычки и ищется по префиксу, так что
+    операторы FTS5 во вводе не интерпретируются.
+    """
+    return ' '.join(
+        '"{}"*'.format(token) for token in SEARCH_TOKEN.findall(value)
+    )
+
 
 class TitleFilter(FilterSet):
-    genre = CharFilter(field_name='genre__slug')
-    category = CharFilter(field_name='category__slug')
+    genre = CharFilter(method='filter_genre')
+    category = CharFilter(method='filter_category')
     year = NumberFilter(field_name='year')
     description = CharFilter(field_name='description')
+    search = CharFilter(method='filter_search')
 
     class Meta:
         model = Title
@@ -18,3 +37,36 @@ class TitleFilter(FilterSet):
             'description',
             'category__slug',
         ]
+
+    def filter_genre(self, queryset, name, value):
+        # id жанра берётся из справочника: без JOIN с таблицей жанров.
+        genre_id = dimensions.genres.get_pk(value)
+        if genre_id is None:
+            return queryset.none()
+        return queryset.filter(genre=genre_id)
+
+    def filter_category(self, queryset, name, value):
+        category_id = dimensions.categories.get_pk(value)
+        if category_id is None:
+            return queryset.none()
+        return queryset.filter(category=category_id)
+
+    def filter_search(self, queryset, name, value):
+        query = build_fts_query(value)
+        if not query:
+            return queryset
+        if connection.vendor != 'sqlite':
+            return queryset.filter(
+                Q(name__icontains=value) | Q(description__icontains=value)
+            )
+        # Индекс reviews_title_fts создаётся миграцией reviews 0006.
+        return queryset.extra(
+            tables=['reviews_title_fts'],
+            where=[
+                'reviews_title_fts.rowid = reviews_title.id',
+                'reviews_title_fts MATCH %s',
+            ],
+            params=[query],
+            select={'search_rank': 'bm25(reviews_title_fts)'},
+            order_by=['search_rank'],
+        )
@@ -0,0 +1,598 @@
+import json
+import logging
+import math
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.cache import get_catalog_cache
+from api.urls import v1_router
+from reviews.models import Comment
+
+User = get_user_model()
+
+ANON = 'anon'
+USER = 'user'
+MODERATOR = 'moderator'
+ADMIN = 'admin'
+ROLES = (ANON, USER, MODERATOR, ADMIN)
+AUTHENTICATED = (USER, MODERATOR, ADMIN)
+UNROUTED = ('signup', 'token', 'cache-stats')
+# Суффикс имени временной копии БД, на которой идут замеры.
+CLONE_SUFFIX = 'benchmark'
+# Логгеры, которые пишут на каждый ответ 4xx/5xx и превышение бюджета.
+QUIET_LOGGERS = ('django.request', 'api.middleware')
+
+# Сценарий: метка, метод, имя маршрута, аргументы маршрута, строка
+# запроса, тело запроса, роли. Аргументы берутся из образцов в БД.
+SCENARIOS = (
+    ('api-root', 'get', 'api-root', (), '', None, ROLES),
+    ('categories-list', 'get', 'category-list', (), '', None, ROLES),
+    (
+        'categories-search',
+        'get',
+        'category-list',
+        (),
+        'search=a',
+        None,
+        ROLES,
+    ),
+    (
+        'categories-create',
+        'post',
+        'category-list',
+        (),
+        '',
+        {'name': 'Бенчмарк', 'slug': 'benchmark'},
+        (ADMIN,),
+    ),
+    (
+        'categories-delete',
+        'delete',
+        'category-detail',
+        ('slug',),
+        '',
+        None,
+        (ADMIN,),
+    ),
+    ('genres-list', 'get', 'genre-list', (), '', None, ROLES),
+    (
+        'genres-create',
+        'post',
+        'genre-list',
+        (),
+        '',
+        {'name': 'Бенчмарк', 'slug': 'benchmark'},
+        (ADMIN,),
+    ),
+    (
+        'genres-delete',
+        'delete',
+        'genre-detail',
+        ('genre_slug',),
+        '',
+        None,
+        (ADMIN,),
+    ),
+    ('titles-list', 'get', 'title-list', (), '', None, ROLES),
+    ('titles-list-100', 'get', 'title-list', (), 'limit=100', None, ROLES),
+    (
+        'titles-filter',
+        'get',
+        'title-list',
+        (),
+        'genre={genre_slug}&category={slug}',
+        None,
+        ROLES,
+    ),
+    (
+        'titles-search',
+        'get',
+        'title-list',
+        (),
+        'search={title_word}',
+        None,
+        ROLES,
+    ),
+    ('titles-detail', 'get', 'title-detail', ('pk',), '', None, ROLES),
+    (
+        'titles-create',
+        'post',
+        'title-list',
+        (),
+        '',
+        {
+            'name': 'Бенчмарк',
+            'year': 2000,
+            'genre': ['{genre_slug}'],
+            'category': '{slug}',
+        },
+        (ADMIN,),
+    ),
+    (
+        'titles-bulk',
+        'post',
+        'title-bulk',
+        (),
+        '',
+        [
+            {
+                'name': 'Бенчмарк',
+                'year': 2000,
+                'genre': ['{genre_slug}'],
+                'category': '{slug}',
+            }
+        ]
+        * 100,
+        (ADMIN,),
+    ),
+    (
+        'titles-update',
+        'patch',
+        'title-detail',
+        ('pk',),
+        '',
+        {'name': 'Бенчмарк'},
+        (ADMIN,),
+    ),
+    (
+        'titles-delete',
+        'delete',
+        'title-detail',
+        ('pk',),
+        '',
+        None,
+        (ADMIN,),
+    ),
+    ('reviews-list', 'get', 'review-list', ('title_id',), '', None, ROLES),
+    (
+        'reviews-cursor',
+        'get',
+        'review-list',
+        ('title_id',),
+        'cursor=',
+        None,
+        ROLES,
+    ),
+    (
+        'reviews-detail',
+        'get',
+        'review-detail',
+        ('title_id', 'review_pk'),
+        '',
+        None,
+        ROLES,
+    ),
+    (
+        'reviews-create',
+        'post',
+        'review-list',
+        ('title_id',),
+        '',
+        {'text': 'Бенчмарк', 'score': 5},
+        AUTHENTICATED,
+    ),
+    (
+        'reviews-update',
+        'patch',
+        'review-detail',
+        ('title_id', 'review_pk'),
+        '',
+        {'score': 7},
+        (MODERATOR, ADMIN),
+    ),
+    (
+        'reviews-delete',
+        'delete',
+        'review-detail',
+        ('title_id', 'review_pk'),
+        '',
+        None,
+        (MODERATOR, ADMIN),
+    ),
+    (
+        'comments-list',
+        'get',
+        'comment-list',
+        ('title_id', 'review_id'),
+        '',
+        None,
+        ROLES,
+    ),
+    (
+        'comments-detail',
+        'get',
+        'comment-detail',
+        ('title_id', 'review_id', 'comment_pk'),
+        '',
+        None,
+        ROLES,
+    ),
+    (
+        'comments-create',
+        'post',
+        'comment-list',
+        ('title_id', 'review_id'),
+        '',
+        {'text': 'Бенчмарк'},
+        AUTHENTICATED,
+    ),
+    (
+        'comments-update',
+        'patch',
+        'comment-detail',
+        ('title_id', 'review_id', 'comment_pk'),
+        '',
+        {'text': 'Бенчмарк'},
+        (MODERATOR, ADMIN),
+    ),
+    (
+        'comments-delete',
+        'delete',
+        'comment-detail',
+        ('title_id', 'review_id', 'comment_pk'),
+        '',
+        None,
+        (MODERATOR, ADMIN),
+    ),
+    ('users-list', 'get', 'user-list', (), '', None, (ADMIN,)),
+    (
+        'users-search',
+        'get',
+        'user-list',
+        (),
+        'search={username}',
+        None,
+        (ADMIN,),
+    ),
+    (
+        'users-detail',
+        'get',
+        'user-detail',
+        ('username',),
+        '',
+        None,
+        (ADMIN,),
+    ),
+    (
+        'users-create',
+        'post',
+        'user-create-user',
+        (),
+        '',
+        {'username': 'benchmark', 'email': 'benchmark@yamdb.fake'},
+        (ADMIN,),
+    ),
+    (
+        'users-update',
+        'patch',
+        'user-detail',
+        ('username',),
+        '',
+        {'bio': 'Бенчмарк'},
+        (ADMIN,),
+    ),
+    (
+        'users-delete',
+        'delete',
+        'user-detail',
+        ('username',),
+        '',
+        None,
+        (ADMIN,),
+    ),
+    (
+        'users-delete-self',
+        'delete',
+        'user-delete-user',
+        (),
+        '',
+        None,
+        (USER,),
+    ),
+    (
+        'users-me',
+        'get',
+        'user-users-own-profile',
+        (),
+        '',
+        None,
+        AUTHENTICATED,
+    ),
+    (
+        'users-me-update',
+        'patch',
+        'user-users-own-profile',
+        (),
+        '',
+        {'bio': 'Бенчмарк'},
+        AUTHENTICATED,
+    ),
+    (
+        'signup',
+        'post',
+        'signup',
+        (),
+        '',
+        {'username': 'benchmark', 'email': 'benchmark@yamdb.fake'},
+        (ANON,),
+    ),
+    (
+        'token',
+        'post',
+        'token',
+        (),
+        '',
+        {'username': '{username}', 'confirmation_code': 'invalid'},
+        (ANON,),
+    ),
+    ('cache-stats', 'get', 'cache-stats', (), '', None, (ADMIN,)),
+)
+
+# Аргументы маршрутов: имя в URL -> ключ образца.
+URL_KWARGS = {
+    'slug': ('slug', 'slug'),
+    'genre_slug': ('slug', 'genre_slug'),
+    'pk': ('pk', 'title_id'),
+    'title_id': ('title_id', 'title_id'),
+    'review_pk': ('pk', 'review_id'),
+    'review_id': ('review_id', 'review_id'),
+    'comment_pk': ('pk', 'comment_id'),
+    'username': ('username', 'username'),
+}
+
+
+def percentile(sorted_values, share):
+    """Перцентиль методом ближайшего ранга."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(share * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@contextmanager
+def disposable_database():
+    """Переключает соединение на копию текущей БД и удаляет её на выходе.
+
+    Замеры идут вне общей транзакции: внутри atomic() справочники не
+    сохраняют снимок, и запросы к каталогу выглядели бы дороже, чем в
+    работе сервиса. Копия SQLite в памяти (тестовая БД) не создаётся.
+    """
+    creation = connection.creation
+    name = connection.settings_dict['NAME']
+    connection.close()
+    creation.clone_test_db(CLONE_SUFFIX, verbosity=0, autoclobber=True)
+    connection.settings_dict['NAME'] = creation.get_test_db_clone_settings(
+        CLONE_SUFFIX
+    )['NAME']
+    get_catalog_cache().clear()
+    try:
+        yield
+    finally:
+        connection.settings_dict['NAME'] = name
+        creation.destroy_test_db(name, verbosity=0, suffix=CLONE_SUFFIX)
+        get_catalog_cache().clear()
+
+
+def format_value(value, template):
+    if isinstance(value, str):
+        return value.format(**template)
+    if isinstance(value, list):
+        return [format_value(item, template) for item in value]
+    if isinstance(value, dict):
+        return {
+            key: format_value(item, template) for key, item in value.items()
+        }
+    return value
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер задержек и числа SQL-запросов для всех маршрутов API. '
+        'Запросы выполняются на временной копии БД.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument(
+            '--only', nargs='*', default=None, help='Метки сценариев.'
+        )
+        parser.add_argument('--output', default='benchmark.json')
+        parser.add_argument(
+            '--cold-cache',
+            action='store_true',
+            help='Очищать кэш каталога перед каждым запросом.',
+        )
+        parser.add_argument(
+            '--baseline', help='JSON прошлого прогона для сравнения.'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=None,
+            help='Завершиться с ошибкой, если p50 вырос больше чем на N %%.',
+        )
+
+    def get_samples(self):
+        comment = (
+            Comment.objects.select_related(
+                'review__title__category', 'author'
+            )
+            .filter(review__title__category__isnull=False)
+            .order_by('pk')
+            .first()
+        )
+        if comment is None:
+            raise CommandError(
+                'Нет данных для замеров: выполните generate_dataset.'
+            )
+        title = comment.review.title
+        genre = title.genre.first()
+        if genre is None:
+            raise CommandError('У произведения для замеров нет жанров.')
+        return {
+            'title_id': title.pk,
+            'review_id': comment.review_id,
+            'comment_id': comment.pk,
+            'slug': title.category.slug,
+            'genre_slug': genre.slug,
+            'username': comment.author.username,
+            'title_word': title.name.split()[0],
+        }
+
+    def get_clients(self):
+        clients = {ANON: Client(raise_request_exception=False)}
+        for role in AUTHENTICATED:
+            user, _ = User.objects.get_or_create(
+                username=f'benchmark_{role}',
+                defaults={
+                    'email': f'benchmark_{role}@yamdb.fake',
+                    'role': role,
+                },
+            )
+            token = AccessToken.for_user(user)
+            clients[role] = Client(
+                raise_request_exception=False,
+                HTTP_AUTHORIZATION=f'Bearer {token}',
+            )
+        return clients
+
+    def check_coverage(self):
+        names = {pattern.name for pattern in v1_router.urls}
+        names.update(UNROUTED)
+        uncovered = names - {scenario[2] for scenario in SCENARIOS}
+        if uncovered:
+            self.stderr.write(
+                'Маршруты без сценариев: ' + ', '.join(sorted(uncovered))
+            )
+
+    def run_request(self, client, method, url, data):
+        if self.cold_cache:
+            get_catalog_cache().clear()
+        # Запрос, меняющий данные, откатывается, чтобы повторы работали
+        # с тем же состоянием БД. Чтение идёт вне транзакции, как в
+        # работе сервиса.
+        rollback = method != 'get'
+        with transaction.atomic() if rollback else nullcontext():
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = getattr(client, method)(
+                    url, data=data, content_type='application/json'
+                )
+                elapsed = time.perf_counter() - started
+            if rollback:
+                transaction.set_rollback(True)
+        return elapsed, len(queries), response.status_code
+
+    def run_scenario(self, client, method, url, data, options):
+        for _ in range(options['warmup']):
+            self.run_request(client, method, url, data)
+        timings, query_counts, statuses = [], [], {}
+        started = time.perf_counter()
+        for _ in range(options['iterations']):
+            elapsed, query_count, status_code = self.run_request(
+                client, method, url, data
+            )
+            timings.append(elapsed * 1000)
+            query_counts.append(query_count)
+            statuses[status_code] = statuses.get(status_code, 0) + 1
+        total = time.perf_counter() - started
+        timings.sort()
+        return {
+            'p50_ms': percentile(timings, 0.50),
+            'p95_ms': percentile(timings, 0.95),
+            'p99_ms': percentile(timings, 0.99),
+            'rps': options['iterations'] / total if total else None,
+            'queries': sum(query_counts) / len(query_counts),
+            'statuses': {str(code): n for code, n in statuses.items()},
+        }
+
+    def build_url(self, url_name, url_args, query, samples):
+        kwargs = {
+            URL_KWARGS[arg][0]: samples[URL_KWARGS[arg][1]]
+            for arg in url_args
+        }
+        url = reverse(url_name, kwargs=kwargs)
+        if query:
+            url = f'{url}?{query.format(**samples)}'
+        return url
+
+    def compare(self, results, baseline_path, threshold):
+        baseline = json.loads(Path(baseline_path).read_text())['results']
+        regressions = []
+        self.stdout.write(
+            f'{"сценарий":<40} {"p50 было":>10} {"p50 стало":>10} '
+            f'{"Δ %":>8} {"запросы":>12}'
+        )
+        for key, result in results.items():
+            old = baseline.get(key)
+            if old is None or not old['p50_ms']:
+                continue
+            delta = (result['p50_ms'] / old['p50_ms'] - 1) * 100
+            self.stdout.write(
+                f'{key:<40} {old["p50_ms"]:>10.2f} '
+                f'{result["p50_ms"]:>10.2f} {delta:>8.1f} '
+                f'{old["queries"]:>5.1f} → {result["queries"]:<5.1f}'
+            )
+            if threshold is not None and delta > threshold:
+                regressions.append(key)
+        if regressions:
+            raise CommandError(
+                'Регрессия p50 больше порога: ' + ', '.join(regressions)
+            )
+
+    def handle(self, *args, **options):
+        self.check_coverage()
+        self.cold_cache = options['cold_cache']
+        for name in QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+        results = {}
+        # Пользователи для ролей создаются во временной копии БД.
+        with disposable_database():
+            samples = self.get_samples()
+            clients = self.get_clients()
+            for label, method, url_name, url_args, query, data, roles in (
+                SCENARIOS
+            ):
+                if options['only'] and label not in options['only']:
+                    continue
+                url = self.build_url(url_name, url_args, query, samples)
+                data = format_value(data, samples)
+                for role in roles:
+                    key = f'{label}:{role}'
+                    results[key] = self.run_scenario(
+                        clients[role], method, url, data, options
+                    )
+                    self.stdout.write(
+                        f'{key:<40} p50 {results[key]["p50_ms"]:7.2f} мс '
+                        f'p95 {results[key]["p95_ms"]:7.2f} мс '
+                        f'{results[key]["queries"]:5.1f} SQL'
+                    )
+
+        Path(options['output']).write_text(
+            json.dumps(
+                {
+                    'meta': {
+                        'iterations': options['iterations'],
+                        'vendor': connection.vendor,
+                        'cold_cache': self.cold_cache,
+                        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    },
+                    'results': results,
+                },
+                ensure_ascii=False,
+                indent=2,
+            )
+        )
+        self.stdout.write(f'Результаты записаны в {options["output"]}')
+        if options['baseline']:
+            self.compare(results, options['baseline'], options['threshold'])
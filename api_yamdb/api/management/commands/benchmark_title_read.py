@@ -0,0 +1,76 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from api.serializers import TitleSerializer, TitleValuesSerializer
+from api.views import TitleViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнение TitleSerializer и TitleValuesSerializer на странице '
+        'произведений: процессорное время и совпадение ответа.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100)
+        parser.add_argument('--iterations', type=int, default=50)
+
+    def read_models(self, queryset):
+        page = list(queryset.all())
+        return page, lambda: TitleSerializer(page, many=True).data
+
+    def read_values(self, queryset):
+        rows = list(TitleValuesSerializer.get_values(queryset))
+        return rows, lambda: TitleValuesSerializer(rows).data
+
+    def measure(self, read, queryset, iterations):
+        """Среднее процессорное время на страницу: всего и после
+        выборки произведений (жанры, данные и JSON)."""
+        renderer = JSONRenderer()
+        total = serialize = 0.0
+        for _ in range(iterations):
+            started = time.process_time()
+            _, build = read(queryset)
+            fetched = time.process_time()
+            content = renderer.render(build())
+            finished = time.process_time()
+            total += finished - started
+            serialize += finished - fetched
+        return content, total / iterations, serialize / iterations
+
+    def handle(self, *args, **options):
+        queryset = TitleViewSet.queryset.order_by('pk')[: options['limit']]
+        if not queryset.exists():
+            raise CommandError('Нет произведений: выполните generate_dataset.')
+        iterations = options['iterations']
+        # Прогрев: первые запросы компилируют SQL и заполняют кэши.
+        self.measure(self.read_models, queryset, 1)
+        self.measure(self.read_values, queryset, 1)
+        expected, models_total, models_serialize = self.measure(
+            self.read_models, queryset, iterations
+        )
+        content, values_total, values_serialize = self.measure(
+            self.read_values, queryset, iterations
+        )
+        if content != expected:
+            raise CommandError(
+                'Ответ TitleValuesSerializer отличается от TitleSerializer.'
+            )
+        self.stdout.write(
+            f'{"":<20} {"всего, мс":>10} {"после выборки, мс":>18}'
+        )
+        self.stdout.write(
+            f'{"TitleSerializer":<20} {models_total * 1000:>10.2f} '
+            f'{models_serialize * 1000:>18.2f}'
+        )
+        self.stdout.write(
+            f'{"values()":<20} {values_total * 1000:>10.2f} '
+            f'{values_serialize * 1000:>18.2f}'
+        )
+        self.stdout.write(
+            f'Ускорение: {models_total / values_total:.1f}x всего, '
+            f'{models_serialize / values_serialize:.1f}x после выборки. '
+            'Ответы совпадают побайтно.'
+        )
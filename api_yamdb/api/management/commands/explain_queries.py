@@ -0,0 +1,191 @@
+import logging
+import re
+from urllib.parse import quote
+
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import get_catalog_cache
+from api.management.commands.benchmark_api import (
+    ADMIN,
+    QUIET_LOGGERS,
+    ROLES,
+    SCENARIOS,
+    disposable_database,
+)
+from api.management.commands.benchmark_api import Command as BenchmarkCommand
+from reviews.models import Title
+
+# Фильтры списков по одному, чтобы план каждого был виден отдельно.
+FILTER_SCENARIOS = (
+    (
+        'titles-filter-genre',
+        'get',
+        'title-list',
+        (),
+        'genre={genre_slug}',
+        None,
+        ROLES,
+    ),
+    (
+        'titles-filter-category',
+        'get',
+        'title-list',
+        (),
+        'category={slug}',
+        None,
+        ROLES,
+    ),
+    (
+        'titles-filter-year',
+        'get',
+        'title-list',
+        (),
+        'year={year}',
+        None,
+        ROLES,
+    ),
+    (
+        'titles-filter-name',
+        'get',
+        'title-list',
+        (),
+        'name={title_name}',
+        None,
+        ROLES,
+    ),
+    (
+        'users-filter-username',
+        'get',
+        'user-list',
+        (),
+        'username={username}',
+        None,
+        (ADMIN,),
+    ),
+)
+
+# Поиск подстроки через LIKE '%...%' индекс использовать не может.
+EXPECTED_SCANS = {
+    'categories-search': 'поиск подстроки в названии',
+    'users-search': 'поиск подстроки в username',
+}
+
+# SCAN без индекса: 'SCAN reviews_title' (в старых SQLite —
+# 'SCAN TABLE reviews_title'). Просмотр индекса и виртуальных таблиц
+# FTS5 пишется как 'SCAN t USING ...' и 'SCAN t VIRTUAL TABLE ...'.
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(?P<table>\w+)$')
+TEMP_SORT = 'USE TEMP B-TREE'
+# Отметки в выводе: просмотр ради условия WHERE — его исправляет
+# индекс; просмотр всей таблицы (страница без фильтра, COUNT без
+# условий) и сортировка во временном B-дереве — для сведения.
+SCAN_MARK = '!'
+INFO_MARK = '~'
+
+
+class Command(BenchmarkCommand):
+    help = (
+        'EXPLAIN QUERY PLAN для всех SQL-запросов, которые выполняют '
+        'GET-маршруты API; отмечает полный просмотр таблиц и сортировку '
+        'без индекса.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only', nargs='*', default=None, help='Метки сценариев.'
+        )
+        parser.add_argument(
+            '--fail-on-scan',
+            action='store_true',
+            help='Завершиться с ошибкой при неожиданном полном просмотре.',
+        )
+
+    def get_samples(self):
+        samples = super().get_samples()
+        title = Title.objects.get(pk=samples['title_id'])
+        samples['year'] = title.year
+        samples['title_name'] = quote(title.name)
+        return samples
+
+    def capture_queries(self, client, url):
+        # Холодный кэш: иначе ответ из кэша не выполняет запросов к БД.
+        get_catalog_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        statements = []
+        for query in queries.captured_queries:
+            sql = query['sql']
+            if sql.startswith('SELECT') and sql not in statements:
+                statements.append(sql)
+        return statements
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def get_mark(self, sql, detail, tables):
+        match = FULL_SCAN.match(detail)
+        if match and match.group('table') in tables:
+            return SCAN_MARK if ' WHERE ' in sql else INFO_MARK
+        if detail.startswith(TEMP_SORT):
+            return INFO_MARK
+        return None
+
+    def write_plan(self, sql, plan, tables):
+        """Печатает план запроса и возвращает таблицы, просмотренные
+        целиком ради условия WHERE."""
+        marks = [self.get_mark(sql, detail, tables) for detail in plan]
+        verbose = self.verbosity > 1
+        if verbose or any(marks):
+            self.stdout.write(f'  {sql[:160]}')
+        for detail, mark in zip(plan, marks):
+            if mark or verbose:
+                self.stdout.write(f'    {mark or " "} {detail}')
+        return {
+            FULL_SCAN.match(detail).group('table')
+            for detail, mark in zip(plan, marks)
+            if mark == SCAN_MARK
+        }
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError(
+                'EXPLAIN QUERY PLAN поддерживает только SQLite.'
+            )
+        self.verbosity = options['verbosity']
+        for name in QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(logging.CRITICAL)
+        tables = set(connection.introspection.table_names())
+        unexpected = []
+        with disposable_database():
+            samples = self.get_samples()
+            clients = self.get_clients()
+            for label, method, url_name, url_args, query, _, roles in (
+                SCENARIOS + FILTER_SCENARIOS
+            ):
+                if method != 'get':
+                    continue
+                if options['only'] and label not in options['only']:
+                    continue
+                url = self.build_url(url_name, url_args, query, samples)
+                role = ADMIN if ADMIN in roles else roles[0]
+                statements = self.capture_queries(clients[role], url)
+                self.stdout.write(
+                    f'{label}: {url}, запросов: {len(statements)}'
+                )
+                scanned = set()
+                for sql in statements:
+                    scanned.update(
+                        self.write_plan(sql, self.explain(sql), tables)
+                    )
+                if scanned and label not in EXPECTED_SCANS:
+                    unexpected.append(
+                        f'{label} ({", ".join(sorted(scanned))})'
+                    )
+        if unexpected:
+            message = 'Полный просмотр таблиц: ' + '; '.join(unexpected)
+            if options['fail_on_scan']:
+                raise CommandError(message)
+            self.stderr.write(message)
@@ -0,0 +1,87 @@
+import pstats
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Ключи сортировки: имя опции -> индекс в записи pstats
+# (число вызовов, число вызовов без рекурсии, собственное время, общее).
+SORT_KEYS = {'calls': 1, 'tottime': 2, 'cumtime': 3}
+
+
+def format_function(key):
+    file_name, line, name = key
+    if file_name == '~':
+        # Встроенные функции: '<built-in method time.perf_counter>'.
+        return name
+    base_dir = f'{settings.BASE_DIR}/'
+    if file_name.startswith(base_dir):
+        file_name = file_name[len(base_dir):]
+    elif 'site-packages/' in file_name:
+        file_name = file_name.split('site-packages/', 1)[1]
+    return f'{file_name}:{line}({name})'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сводный отчёт по профилям ProfilerMiddleware: самые затратные '
+        'функции по каждому представлению.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=str(settings.PROFILER_DIR))
+        parser.add_argument(
+            '--view', nargs='*', default=None, help='Имена представлений.'
+        )
+        parser.add_argument(
+            '--sort', choices=tuple(SORT_KEYS), default='tottime'
+        )
+        parser.add_argument('--limit', type=int, default=20)
+
+    def get_views(self, directory, names):
+        views = sorted(
+            path
+            for path in directory.iterdir()
+            if path.is_dir() and any(path.glob('*.prof'))
+        )
+        if names:
+            views = [path for path in views if path.name in names]
+        return views
+
+    def write_view(self, view_dir, sort, limit):
+        files = sorted(view_dir.glob('*.prof'))
+        stats = pstats.Stats(*map(str, files))
+        requests_count = len(files)
+        self.stdout.write(
+            f'{view_dir.name}: {requests_count} запросов, '
+            f'{stats.total_tt * 1000 / requests_count:.1f} мс на запрос'
+        )
+        self.stdout.write(
+            f'{"вызовы":>10} {"своё, мс":>10} {"всего, мс":>10} '
+            f'{"доля":>6}  функция'
+        )
+        rows = sorted(
+            stats.stats.items(),
+            key=lambda item: item[1][SORT_KEYS[sort]],
+            reverse=True,
+        )
+        for key, (_, calls, tottime, cumtime, _) in rows[:limit]:
+            # Время — среднее на один профилированный запрос.
+            self.stdout.write(
+                f'{calls / requests_count:>10.1f} '
+                f'{tottime * 1000 / requests_count:>10.2f} '
+                f'{cumtime * 1000 / requests_count:>10.2f} '
+                f'{tottime / stats.total_tt if stats.total_tt else 0:>6.1%}'
+                f'  {format_function(key)}'
+            )
+        self.stdout.write('')
+
+    def handle(self, *args, **options):
+        directory = Path(options['dir'])
+        if not directory.is_dir():
+            raise CommandError(f'Нет профилей в {directory}.')
+        views = self.get_views(directory, options['view'])
+        if not views:
+            raise CommandError(f'Нет профилей в {directory}.')
+        for view_dir in views:
+            self.write_view(view_dir, options['sort'], options['limit'])
@@ -0,0 +1,517 @@
+import json
+import logging
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand, CommandError
+
+from api.management.commands.benchmark_api import percentile
+
+User = get_user_model()
+
+DEFAULT_COLLECTION = (
+    settings.BASE_DIR.parent
+    / 'postman_collection'
+    / 'Ymdb-collection.postman_collection.json'
+)
+DEFAULT_BASE_URL = 'http://127.0.0.1:8000'
+# Папка коллекции, которая удаляет созданные объекты: выполняется
+# последовательно уже после нагрузки.
+CLEANUP_FOLDER = 'delete_requests'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+SERVER_START_TIMEOUT = 30
+
+VARIABLE_RE = re.compile(r'{{\s*([\w-]+)\s*}}')
+# Тесты коллекции сохраняют поля ответа так:
+#   const titleId = _.get(responseData, "id");
+#   pm.collectionVariables.set("adminTitle", titleId);
+GET_RE = re.compile(
+    r'const (\w+) = _\.get\(responseData, ["\']([\w.]+)["\']\)'
+)
+SET_RE = re.compile(r'pm\.collectionVariables\.set\(["\'](\w+)["\'], (\w+)\)')
+STATUS_RE = re.compile(r'\.to\.be\.eql\(["\']([^"\']+)["\']\)')
+STATUS_BY_PHRASE = {status.phrase: status.value for status in HTTPStatus}
+# Коды подтверждения приходят по почте, поэтому берутся из БД:
+# userConfirmationCode -> пользователь из переменной userUsername.
+CONFIRMATION_CODE_SUFFIX = 'ConfirmationCode'
+USERNAME_SUFFIX = 'Username'
+
+CollectionRequest = namedtuple(
+    'CollectionRequest',
+    'label folder method url headers body token expected extract',
+)
+
+
+def walk_items(items, path=(), auth=None):
+    """Запросы коллекции в порядке выполнения с унаследованной auth."""
+    for item in items:
+        item_auth = item.get('auth', auth)
+        if 'item' in item:
+            yield from walk_items(
+                item['item'], path + (item['name'],), item_auth
+            )
+        else:
+            yield path + (item['name'],), item, item_auth
+
+
+def get_token_template(auth):
+    if not auth or auth.get('type') != 'bearer':
+        return None
+    for entry in auth.get('bearer', ()):
+        if entry.get('key') == 'token':
+            return entry.get('value')
+    return None
+
+
+def get_test_script(item):
+    return '\n'.join(
+        line
+        for event in item.get('event', ())
+        if event.get('listen') == 'test'
+        for line in event['script'].get('exec', ())
+    )
+
+
+def parse_extract(script):
+    """Какие переменные коллекции тест берёт из каких полей ответа."""
+    paths = dict(GET_RE.findall(script))
+    return {
+        variable: paths[local]
+        for variable, local in SET_RE.findall(script)
+        if local in paths
+    }
+
+
+def parse_expected_status(script):
+    for phrase in STATUS_RE.findall(script):
+        if phrase in STATUS_BY_PHRASE:
+            return STATUS_BY_PHRASE[phrase]
+    return None
+
+
+def parse_collection(path):
+    """Читает коллекцию: значения переменных и список запросов."""
+    try:
+        collection = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError) as error:
+        raise CommandError(f'Не удалось прочитать коллекцию: {error}')
+    variables = {
+        variable['key']: variable.get('value', '')
+        for variable in collection.get('variable', ())
+    }
+    collection_requests = []
+    for path_names, item, auth in walk_items(
+        collection['item'], auth=collection.get('auth')
+    ):
+        request = item['request']
+        url = request['url']
+        body = request.get('body') or {}
+        script = get_test_script(item)
+        collection_requests.append(
+            CollectionRequest(
+                label='/'.join(path_names),
+                folder=path_names[0],
+                method=request['method'].upper(),
+                url=url['raw'] if isinstance(url, dict) else url,
+                headers=[
+                    (header['key'], header['value'])
+                    for header in request.get('header', ())
+                    if not header.get('disabled')
+                ],
+                body=body.get('raw') if body.get('mode') == 'raw' else None,
+                token=get_token_template(request.get('auth', auth)),
+                expected=parse_expected_status(script),
+                extract=parse_extract(script),
+            )
+        )
+    return variables, collection_requests
+
+
+def get_path(data, path):
+    for key in path.split('.'):
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+def substitute(text, variables):
+    """Подставляет {{переменные}}; неизвестные остаются как есть."""
+    return VARIABLE_RE.sub(
+        lambda match: str(variables.get(match.group(1), match.group(0))),
+        text,
+    )
+
+
+class Stats:
+    """Задержки и статусы по запросам коллекции."""
+
+    def __init__(self):
+        self.timings = {}
+        self.statuses = {}
+        self.errors = Counter()
+        self.unexpected = Counter()
+
+    def add(self, request, elapsed, status_code):
+        self.timings.setdefault(request.label, []).append(elapsed * 1000)
+        self.statuses.setdefault(request.label, Counter())[
+            status_code or 'error'
+        ] += 1
+        # Ошибка — обрыв соединения или 5xx; расхождение с ожидаемым
+        # коллекцией статусом считается отдельно.
+        if status_code is None or status_code >= 500:
+            self.errors[request.label] += 1
+        if request.expected and status_code != request.expected:
+            self.unexpected[request.label] += 1
+
+    def merge(self, other):
+        for label, timings in other.timings.items():
+            self.timings.setdefault(label, []).extend(timings)
+        for label, statuses in other.statuses.items():
+            self.statuses.setdefault(label, Counter()).update(statuses)
+        self.errors.update(other.errors)
+        self.unexpected.update(other.unexpected)
+
+    def summary(self):
+        results = {}
+        for label, timings in self.timings.items():
+            timings = sorted(timings)
+            total = len(timings)
+            results[label] = {
+                'count': total,
+                'error_rate': self.errors[label] / total,
+                'unexpected_rate': self.unexpected[label] / total,
+                'p50_ms': percentile(timings, 0.50),
+                'p95_ms': percentile(timings, 0.95),
+                'p99_ms': percentile(timings, 0.99),
+                'max_ms': timings[-1],
+                'statuses': {
+                    str(code): count
+                    for code, count in self.statuses[label].items()
+                },
+            }
+        return results
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон postman-коллекции: переменные (токены, id) '
+        'заполняются последовательным прогоном, затем запросы без '
+        'изменения данных повторяются параллельно виртуальными '
+        'пользователями. Данные для коллекции создаёт set_up_data.sh.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collection', default=str(DEFAULT_COLLECTION))
+        parser.add_argument('--base-url', default=DEFAULT_BASE_URL)
+        parser.add_argument(
+            '--start-server',
+            action='store_true',
+            help='Запустить runserver на адресе из --base-url.',
+        )
+        parser.add_argument(
+            '--users', type=int, default=10, help='Виртуальных пользователей.'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=5,
+            help='Проходов коллекции на виртуального пользователя.',
+        )
+        parser.add_argument('--timeout', type=float, default=10)
+        parser.add_argument(
+            '--keep-alive',
+            action='store_true',
+            help=(
+                'Переиспользовать соединения. С runserver это добавляет '
+                '~40 мс на запрос из-за отложенных ACK.'
+            ),
+        )
+        parser.add_argument(
+            '--only', nargs='*', default=None, help='Папки коллекции.'
+        )
+        parser.add_argument(
+            '--keep-data',
+            action='store_true',
+            help=f'Не выполнять папку {CLEANUP_FOLDER} после нагрузки.',
+        )
+        parser.add_argument('--output', default=None)
+
+    def get_confirmation_code(self, variable, variables):
+        prefix = variable[: -len(CONFIRMATION_CODE_SUFFIX)]
+        username = variables.get(prefix + USERNAME_SUFFIX)
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            self.stderr.write(
+                f'Пользователь {username} не найден: '
+                'выполните postman_collection/set_up_data.sh.'
+            )
+            return variables.get(variable)
+        return default_token_generator.make_token(user)
+
+    def resolve_codes(self, request, variables):
+        templates = [request.url, request.body or '', request.token or '']
+        for template in templates:
+            for variable in VARIABLE_RE.findall(template):
+                if variable.endswith(CONFIRMATION_CODE_SUFFIX):
+                    variables[variable] = self.get_confirmation_code(
+                        variable, variables
+                    )
+
+    def send(self, session, request, variables):
+        """Отправляет запрос; возвращает время, статус и ответ."""
+        parts = urlsplit(substitute(request.url, variables))
+        url = self.base_url + parts.path
+        if parts.query:
+            url = f'{url}?{parts.query}'
+        headers = {
+            key: substitute(value, variables) for key, value in request.headers
+        }
+        data = None
+        if request.body:
+            data = substitute(request.body, variables).encode()
+            headers.setdefault('Content-Type', 'application/json')
+        if request.token:
+            token = substitute(request.token, variables)
+            headers['Authorization'] = f'Bearer {token}'
+        # Без keep-alive каждый запрос идёт по новому соединению.
+        client = session if self.keep_alive else requests
+        started = time.perf_counter()
+        try:
+            response = client.request(
+                request.method,
+                url,
+                data=data,
+                headers=headers,
+                timeout=self.timeout,
+            )
+        except requests.RequestException:
+            return time.perf_counter() - started, None, None
+        return time.perf_counter() - started, response.status_code, response
+
+    def extract(self, request, response, variables):
+        if not request.extract or response is None or not response.ok:
+            return
+        try:
+            data = response.json()
+        except ValueError:
+            return
+        for variable, path in request.extract.items():
+            value = get_path(data, path)
+            if value:
+                variables[variable] = value
+
+    def run_sequence(self, collection_requests, variables, stats):
+        """Последовательный прогон, как в Postman Runner.
+
+        Возвращает статусы ответов по запросам.
+        """
+        statuses = {}
+        with requests.Session() as session:
+            for request in collection_requests:
+                self.resolve_codes(request, variables)
+                elapsed, status_code, response = self.send(
+                    session, request, variables
+                )
+                stats.add(request, elapsed, status_code)
+                statuses[request.label] = status_code
+                self.extract(request, response, variables)
+        return statuses
+
+    def run_virtual_user(self, index, load_requests, variables, barrier):
+        stats = Stats()
+        # Пользователи стартуют с разных запросов, чтобы нагрузка
+        # не шла волной по одному маршруту.
+        shift = index * len(load_requests) // self.users
+        order = load_requests[shift:] + load_requests[:shift]
+        with requests.Session() as session:
+            barrier.wait()
+            for _ in range(self.iterations):
+                for request in order:
+                    elapsed, status_code, _ = self.send(
+                        session, request, variables
+                    )
+                    stats.add(request, elapsed, status_code)
+        self.user_stats[index] = stats
+
+    def run_load(self, load_requests, variables):
+        barrier = threading.Barrier(self.users + 1)
+        self.user_stats = [None] * self.users
+        threads = [
+            threading.Thread(
+                target=self.run_virtual_user,
+                args=(index, load_requests, variables, barrier),
+                daemon=True,
+            )
+            for index in range(self.users)
+        ]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        stats = Stats()
+        for user_stats in self.user_stats:
+            if user_stats is not None:
+                stats.merge(user_stats)
+        return stats, elapsed
+
+    def is_replayable(self, request, status_code):
+        """Запрос можно повторять параллельно без изменения данных.
+
+        Это безопасные методы и запросы, которые коллекция ожидает
+        отклонёнными (4xx) и которые действительно были отклонены
+        при последовательном прогоне.
+        """
+        if request.method in SAFE_METHODS:
+            return True
+        return all(
+            code is not None and 400 <= code < 500
+            for code in (request.expected, status_code)
+        )
+
+    def warn_unresolved(self, collection_requests, variables):
+        unresolved = {
+            variable
+            for request in collection_requests
+            for template in (request.url, request.body, request.token)
+            if template
+            for variable in VARIABLE_RE.findall(template)
+            if variable not in variables
+        }
+        if unresolved:
+            self.stderr.write(
+                'Переменные без значений: ' + ', '.join(sorted(unresolved))
+            )
+
+    def start_server(self):
+        address = urlsplit(self.base_url).netloc
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                str(settings.BASE_DIR / 'manage.py'),
+                'runserver',
+                address,
+                '--noreload',
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError('runserver завершился при запуске.')
+            try:
+                requests.get(self.base_url, timeout=1)
+            except requests.RequestException:
+                time.sleep(0.2)
+            else:
+                return process
+        process.terminate()
+        raise CommandError(f'Сервер {self.base_url} не запустился.')
+
+    def write_table(self, title, results):
+        self.stdout.write(title)
+        self.stdout.write(
+            f'{"запрос":<80} {"n":>6} {"ошибки":>7} {"не тот":>7} '
+            f'{"p50":>8} {"p95":>8} {"p99":>8} {"max":>8}'
+        )
+        for label, result in results.items():
+            self.stdout.write(
+                f'{label:<80} {result["count"]:>6} '
+                f'{result["error_rate"]:>7.1%} '
+                f'{result["unexpected_rate"]:>7.1%} '
+                f'{result["p50_ms"]:>8.1f} {result["p95_ms"]:>8.1f} '
+                f'{result["p99_ms"]:>8.1f} {result["max_ms"]:>8.1f}'
+            )
+
+    def handle(self, *args, **options):
+        self.base_url = options['base_url'].rstrip('/')
+        self.timeout = options['timeout']
+        self.keep_alive = options['keep_alive']
+        self.users = options['users']
+        self.iterations = options['iterations']
+        if self.users < 1 or self.iterations < 1:
+            raise CommandError('--users и --iterations должны быть > 0.')
+        # requests пишет в лог каждое новое соединение.
+        logging.getLogger('urllib3').setLevel(logging.WARNING)
+        variables, collection_requests = parse_collection(
+            options['collection']
+        )
+        setup = [
+            request
+            for request in collection_requests
+            if request.folder != CLEANUP_FOLDER
+        ]
+        cleanup = [
+            request
+            for request in collection_requests
+            if request.folder == CLEANUP_FOLDER
+        ]
+
+        server = self.start_server() if options['start_server'] else None
+        try:
+            sequence_stats = Stats()
+            statuses = self.run_sequence(setup, variables, sequence_stats)
+            load_requests = [
+                request
+                for request in setup
+                if self.is_replayable(request, statuses[request.label])
+                and (not options['only'] or request.folder in options['only'])
+            ]
+            if not load_requests:
+                raise CommandError('Нет запросов для нагрузки.')
+            self.warn_unresolved(load_requests, variables)
+            load_stats, elapsed = self.run_load(load_requests, variables)
+            if not options['keep_data']:
+                self.run_sequence(cleanup, variables, sequence_stats)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+        sequence = sequence_stats.summary()
+        load = load_stats.summary()
+        self.write_table('Последовательный прогон:', sequence)
+        self.write_table(
+            f'Нагрузка: {self.users} пользователей × '
+            f'{self.iterations} проходов:',
+            load,
+        )
+        total = sum(result['count'] for result in load.values())
+        errors = sum(load_stats.errors.values())
+        unexpected = sum(load_stats.unexpected.values())
+        self.stdout.write(
+            f'Всего {total} запросов за {elapsed:.2f} с '
+            f'({total / elapsed if elapsed else total:.0f} запросов/с), '
+            f'ошибки {errors / total:.1%}, '
+            f'не тот статус {unexpected / total:.1%}.'
+        )
+        if options['output']:
+            Path(options['output']).write_text(
+                json.dumps(
+                    {
+                        'base_url': self.base_url,
+                        'users': self.users,
+                        'iterations': self.iterations,
+                        'elapsed_s': elapsed,
+                        'sequence': sequence,
+                        'load': load,
+                    },
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            )
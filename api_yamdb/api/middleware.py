@@ -0,0 +1,207 @@
+import cProfile
+import itertools
+import logging
+import os
+import re
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.exceptions import APIException
+
+from api.authentication import CachedJWTAuthentication
+from api.cache import current_versions
+from api.timing import DB, TOTAL, ServerTiming, current_timing
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """Запрос выполнил больше SQL-запросов, чем разрешено вьюсету."""
+
+
+class QueryCounter:
+    """Обёртка execute_wrapper, считающая запросы и время в БД."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+def get_view_name(request, view_func):
+    """Имя представления для отчётов: TitleViewSet.list, signup и т.п."""
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return getattr(view_func, '__name__', 'view')
+    action = getattr(view_func, 'actions', {}).get(request.method.lower())
+    if action is None:
+        return view_class.__name__
+    return f'{view_class.__name__}.{action}'
+
+
+def get_query_budget(view_func):
+    """Бюджет из атрибута query_budget класса представления.
+
+    Действие может переопределить его: @action(..., query_budget=None).
+    """
+    initkwargs = getattr(view_func, 'initkwargs', {})
+    if 'query_budget' in initkwargs:
+        return initkwargs['query_budget']
+    view_class = getattr(view_func, 'cls', None)
+    return getattr(
+        view_class, 'query_budget', getattr(view_func, 'query_budget', None)
+    )
+
+
+class QueryBudgetMiddleware:
+    """Считает SQL-запросы и время в БД для каждого запроса.
+
+    Результат попадает в заголовки X-DB-Queries и X-DB-Time-Ms. Если
+    у вьюсета задан query_budget и он превышен, пишется предупреждение
+    в лог, а при QUERY_BUDGET_RAISE — выбрасывается исключение.
+    При QUERY_BUDGET_ENABLED = False Django не подключает middleware.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        response['X-DB-Queries'] = str(counter.count)
+        response['X-DB-Time-Ms'] = f'{counter.duration * 1000:.2f}'
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and counter.count > budget:
+            message = (
+                f'{request.method} {request.path}: {counter.count} '
+                f'SQL-запросов при бюджете {budget}'
+            )
+            if settings.QUERY_BUDGET_RAISE:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func)
+
+
+class CatalogVersionMiddleware:
+    """Версии ресурсов каталога читаются из общего кэша раз за запрос."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_versions.set({})
+        try:
+            return self.get_response(request)
+        finally:
+            current_versions.reset(token)
+
+
+class ServerTimingMiddleware:
+    """Заголовок Server-Timing с временем фаз обработки запроса.
+
+    Время аутентификации, проверки прав, сериализации и рендеринга
+    замеряют хуки DRF (api.timing.measure), время SQL-запросов —
+    execute_wrapper. Фазы могут пересекаться: db входит в auth и
+    serializer, если они обращаются к БД. При SERVER_TIMING_ENABLED =
+    False Django не подключает middleware.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SERVER_TIMING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timing = ServerTiming()
+        counter = QueryCounter()
+        token = current_timing.set(timing)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(counter))
+                response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        timing.add(DB, counter.duration, f'{counter.count} queries')
+        timing.add(TOTAL, time.perf_counter() - started)
+        response['Server-Timing'] = timing.header()
+        return response
+
+
+class ProfilerMiddleware:
+    """Выборочное профилирование запросов через cProfile.
+
+    Профилируется каждый PROFILER_SAMPLE_RATE-й запрос, а также запросы
+    администратора с заголовком X-Profile. Статистика сохраняется в
+    формате pstats в PROFILER_DIR/<представление>/, в каждой папке
+    остаётся не больше PROFILER_MAX_FILES последних файлов. Отчёт
+    строит команда profile_report.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILER_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.counter = itertools.count(1)
+        self.authentication = CachedJWTAuthentication()
+
+    def is_admin_request(self, request):
+        if settings.PROFILER_HEADER not in request.META:
+            return False
+        try:
+            result = self.authentication.authenticate(request)
+        except APIException:
+            return False
+        return result is not None and result[0].is_admin
+
+    def should_profile(self, request):
+        rate = settings.PROFILER_SAMPLE_RATE
+        if rate and next(self.counter) % rate == 0:
+            return True
+        return self.is_admin_request(request)
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return self.get_response(request)
+        finally:
+            profiler.disable()
+            self.save(profiler, getattr(request, 'view_name', 'unresolved'))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.view_name = get_view_name(request, view_func)
+
+    def save(self, profiler, view_name):
+        directory = Path(settings.PROFILER_DIR) / re.sub(
+            r'[^\w.-]', '_', view_name
+        )
+        directory.mkdir(parents=True, exist_ok=True)
+        # Имя из времени в наносекундах: сортировка по имени совпадает
+        # с порядком записи.
+        profiler.dump_stats(directory / f'{time.time_ns()}-{os.getpid()}.prof')
+        files = sorted(directory.glob('*.prof'))
+        for path in files[: -settings.PROFILER_MAX_FILES]:
+            path.unlink(missing_ok=True)
@@ -1,11 +1,27 @@
+from hashlib import md5
+
+from django.http import Http404
+from django.utils.cache import get_conditional_response, quote_etag
+from rest_framework import status
 from rest_framework.filters import SearchFilter
 from rest_framework.mixins import (
     CreateModelMixin,
     DestroyModelMixin,
     ListModelMixin,
 )
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
+from api.cache import (
+    HIT,
+    MISS,
+    get_cached_count,
+    get_catalog_cache,
+    get_response_key,
+    get_version,
+    record,
+)
+from api.pagination import PublicationPagination
 from api.permissions import (
     AdminPermission,
     AuthorPermission,
@@ -14,10 +30,151 @@ from api.permissions import (
     ModeratorPermission,
     OnlyAdminPostPermissons,
 )
+from api.timing import PERMISSIONS, measure
+
+
+class ServerTimingMixin:
+    """Замер проверки прав (фаза perm) для заголовка Server-Timing."""
+
+    def check_permissions(self, request):
+        with measure(PERMISSIONS):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with measure(PERMISSIONS):
+            super().check_object_permissions(request, obj)
+
+
+class ConditionalGetMixin:
+    """Условные GET-запросы по ETag.
+
+    ETag строится из пути запроса и версий ресурсов etag_resources,
+    которые меняются сигналами при любой записи, поэтому ответ 304
+    отдаётся без запросов к выборке и без сериализации. Last-Modified
+    не отдаётся: время изменения не меняется при удалении строки, и
+    If-Modified-Since ответил бы 304 на устаревшие данные.
+    """
+
+    etag_resources = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_etag_parts(self, request):
+        return [request.get_full_path()] + [
+            get_version(resource) for resource in self.etag_resources
+        ]
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        etag = quote_etag(
+            md5(
+                ':'.join(map(str, self.get_etag_parts(request))).encode()
+            ).hexdigest()
+        )
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response['ETag'] = etag
+        return response
+
+
+class CatalogCacheMixin:
+    """Кэширует ответы на GET-запросы с учётом версии ресурса.
+
+    Версия ресурса повышается сигналами при любой записи в связанные
+    модели, поэтому старые ключи просто перестают запрашиваться и
+    вытесняются по LRU. Заголовок ETag хранится вместе с данными, так
+    что из кэша можно ответить и 304.
+    """
+
+    cache_resource = None
+    cached_headers = ('ETag', 'X-Count-Source')
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        cache = get_catalog_cache()
+        key = get_response_key(
+            self.cache_resource, request.build_absolute_uri()
+        )
+        entry = cache.get(key)
+        if entry is not None:
+            record(HIT)
+            data, headers = entry
+            response = get_conditional_response(
+                request,
+                etag=headers.get('ETag'),
+                response=Response(data, headers=headers),
+            )
+            response['X-Cache'] = 'HIT'
+            return response
+        record(MISS)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            headers = {
+                header: response[header]
+                for header in self.cached_headers
+                if header in response
+            }
+            cache.set(key, (response.data, headers))
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def get_count_estimate(self):
+        return get_cached_count(self.cache_resource, self.get_queryset())
+
+
+class ValuesReadMixin:
+    """Чтение списка и объекта без экземпляров модели.
+
+    Выборка идёт через values(), данные строит values_serializer_class;
+    создание и изменение по-прежнему используют serializer_class.
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.values_serializer_class.get_values(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                self.values_serializer_class(page).data
+            )
+        return Response(self.values_serializer_class(list(queryset)).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        rows = list(self.values_serializer_class.get_values(queryset)[:1])
+        if not rows:
+            raise Http404
+        self.check_object_permissions(request, rows[0])
+        return Response(self.values_serializer_class(rows).data[0])
 
 
 class CreateDestroyListViewSet(
-    CreateModelMixin, DestroyModelMixin, ListModelMixin, GenericViewSet
+    ServerTimingMixin,
+    CatalogCacheMixin,
+    CreateModelMixin,
+    DestroyModelMixin,
+    ListModelMixin,
+    GenericViewSet,
 ):
     """Миксин для жанров и категорий"""
 
@@ -25,10 +182,15 @@ class CreateDestroyListViewSet(
     filter_backends = (SearchFilter,)
     search_fields = ('name',)
     permission_classes = (OnlyAdminPostPermissons,)
+    query_budget = 6
 
 
-class PublicationPermissionViewSet(ModelViewSet):
+class PublicationPermissionViewSet(
+    ServerTimingMixin, ConditionalGetMixin, ModelViewSet
+):
     permission_classes = (AuthorPermission, DisablePUTMethod)
+    pagination_class = PublicationPagination
+    query_budget = 8
 
     def get_permissions(self):
         if self.request.user.is_anonymous:
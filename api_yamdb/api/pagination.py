@@ -0,0 +1,92 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.settings import api_settings
+
+# Откуда взят count ответа (заголовок X-Count-Source).
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_LOWER_BOUND = 'lower-bound'
+
+
+class EstimatedCountPagination(LimitOffsetPagination):
+    """Limit/offset без SELECT COUNT(*) по всей выборке на каждой странице.
+
+    Без фильтров count берётся из get_count_estimate() вьюсета:
+    поддерживаемого счётчика или закэшированного значения. Отфильтрованная
+    выборка считается точно, но не дальше exact_count_limit строк за
+    текущей страницей; если строк больше, count — нижняя граница.
+    Параметр ?count=exact включает точный подсчёт.
+    """
+
+    count_query_param = 'count'
+    exact_count_limit = 1000
+    count_header = 'X-Count-Source'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        self.count_source = COUNT_EXACT
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response[self.count_header] = self.count_source
+        return response
+
+    def is_filtered(self, request):
+        pagination_params = {
+            self.limit_query_param,
+            self.offset_query_param,
+            self.count_query_param,
+            api_settings.URL_FORMAT_OVERRIDE,
+        }
+        return bool(set(request.query_params) - pagination_params)
+
+    def get_count(self, queryset):
+        request = self.request
+        if request.query_params.get(self.count_query_param) == COUNT_EXACT:
+            return super().get_count(queryset)
+        get_count_estimate = getattr(self.view, 'get_count_estimate', None)
+        if get_count_estimate is not None and not self.is_filtered(request):
+            count = get_count_estimate()
+            if count is not None:
+                self.count_source = COUNT_ESTIMATE
+                return count
+        # Считаем строки до текущей страницы и exact_count_limit после неё.
+        bound = self.get_offset(request) + self.limit + self.exact_count_limit
+        count = super().get_count(queryset[:bound + 1])
+        if count > bound:
+            self.count_source = COUNT_LOWER_BOUND
+        return count
+
+
+class PublicationCursorPagination(CursorPagination):
+    """Курсорная пагинация отзывов и комментариев по (pub_date, id)."""
+
+    ordering = ('-pub_date', '-id')
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class PublicationPagination(EstimatedCountPagination):
+    """Limit/offset по умолчанию, курсор — если передан параметр cursor.
+
+    Первая страница в курсорном режиме запрашивается с пустым `?cursor=`,
+    дальше клиент идёт по ссылкам next/previous.
+    """
+
+    cursor_pagination_class = PublicationCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        if cursor_param in request.query_params:
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
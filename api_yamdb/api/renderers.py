@@ -0,0 +1,19 @@
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+
+from api.timing import RENDER, measure
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer с замером фазы render для Server-Timing."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with measure(RENDER):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class TimedBrowsableAPIRenderer(BrowsableAPIRenderer):
+    """BrowsableAPIRenderer с замером фазы render для Server-Timing."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with measure(RENDER):
+            return super().render(data, accepted_media_type, renderer_context)
@@ -1,16 +1,40 @@
 import re
+from operator import attrgetter
 
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.relations import MANY_RELATION_KWARGS
+from rest_framework.settings import api_settings
 from rest_framework.validators import ValidationError
 
+from api import dimensions
+from api.cache import bump_version
+from api.timing import SERIALIZER, measure
 from reviews.constants import NAME_MAX_LENGTH, SLUG_MAX_LENGTH
 from reviews.models import Category, Comment, Genre, Review, Title
 
 User = get_user_model()
 
 
-class BaseNameSlugSerializer(serializers.ModelSerializer):
+class TimedSerializerMixin:
+    """Замер фазы serializer (валидация и представление) для Server-Timing."""
+
+    def run_validation(self, data=empty):
+        with measure(SERIALIZER):
+            return super().run_validation(data)
+
+    def to_representation(self, instance):
+        with measure(SERIALIZER):
+            return super().to_representation(instance)
+
+
+class BaseNameSlugSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
     """Базовый ссериализатор дл полей name и slug."""
 
     def validate_name(self, value):
@@ -48,7 +72,7 @@ class GenreSerializer(BaseNameSlugSerializer):
         fields = ('name', 'slug')
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Сериализатор произведений."""
 
     genre = GenreSerializer(many=True, required=False)
@@ -74,17 +98,144 @@ class TitleSerializer(serializers.ModelSerializer):
         }
 
 
-class TitleCreateUpdateSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+class TitleValuesSerializer:
+    """Быстрое представление произведений только для чтения.
+
+    Строит те же данные, что TitleSerializer, из словарей values():
+    без экземпляров моделей и объектов полей на каждую строку. Жанры
+    всех произведений выбираются одним запросом, названия категорий и
+    жанров берутся из справочников в памяти процесса.
+    """
+
+    fields = (
+        'id',
+        'name',
+        'year',
+        'description',
+        'category_id',
+        'score_sum',
+        'review_count',
+    )
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def get_values(cls, queryset):
+        return queryset.prefetch_related(None).values(*cls.fields)
+
+    def get_genres(self):
+        genres = {}
+        through = Title.genre.through.objects.filter(
+            title_id__in=[row['id'] for row in self.rows]
+        )
+        links = list(
+            through.order_by('title_id', 'genre_id').values_list(
+                'title_id', 'genre_id'
+            )
+        )
+        snapshot = dimensions.genres.get_snapshot(
+            pks={genre_id for _, genre_id in links}
+        )
+        for title_id, genre_id in links:
+            data = snapshot.get_data(genre_id)
+            # None — жанр удалён уже после чтения связей.
+            if data is not None:
+                genres.setdefault(title_id, []).append(data)
+        return genres
+
+    @staticmethod
+    def to_data(row, genres, category):
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'year': row['year'],
+            'description': row['description'],
+            'genre': genres,
+            'category': category,
+            'rating': Title.calculate_rating(
+                row['score_sum'], row['review_count']
+            ),
+        }
+
+    @property
+    def data(self):
+        if not self.rows:
+            return []
+        genres = self.get_genres()
+        categories = dimensions.categories.get_snapshot(
+            pks={row['category_id'] for row in self.rows} - {None}
+        )
+        with measure(SERIALIZER):
+            return [
+                self.to_data(
+                    row,
+                    genres.get(row['id'], []),
+                    categories.get_data(row['category_id']),
+                )
+                for row in self.rows
+            ]
+
+
+class CachedSlugManyRelatedField(serializers.ManyRelatedField):
+    """Список slug разрешается целиком, а не по одному объекту."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.get_objects(data)
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который ищет объекты в справочнике процесса.
+
+    Справочник выбирается по модели queryset; список slug (many=True)
+    разрешается за одно обращение к нему.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(slug_field='slug', **kwargs)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return CachedSlugManyRelatedField(**list_kwargs)
+
+    def get_objects(self, slugs):
+        if not all(isinstance(slug, str) for slug in slugs):
+            self.fail('invalid')
+        model = self.queryset.model
+        # Пачка произведений разрешает slug заранее (TitleBulkSerializer).
+        objects = self.context.get('dimension_objects', {}).get(model)
+        if objects is None:
+            objects = dimensions.DIMENSIONS[model].get_objects(slugs)
+        for slug in slugs:
+            if slug not in objects:
+                self.fail(
+                    'does_not_exist', slug_name=self.slug_field, value=slug
+                )
+        return [objects[slug] for slug in slugs]
+
+    def to_internal_value(self, data):
+        return self.get_objects([data])[0]
+
+
+class TitleCreateUpdateSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
+    genre = CachedSlugRelatedField(
         many=True,
-        slug_field='slug',
         queryset=Genre.objects.all(),
         required=False,
     )
-    category = serializers.SlugRelatedField(
-        slug_field='slug', queryset=Category.objects.all(), required=False
+    category = CachedSlugRelatedField(
+        queryset=Category.objects.all(), required=False
     )
-    year = serializers.IntegerField(required=False)
 
     class Meta:
         model = Title
@@ -97,15 +248,241 @@ class TitleCreateUpdateSerializer(serializers.ModelSerializer):
             'category',
         )
 
+    # Жанры, записанные create/update, для ответа без повторного чтения.
+    genres = None
+
+    def set_genres(self, instance, genres, current):
+        """Меняет жанры разницей множеств с текущими id жанров: удаляются
+        и добавляются только изменившиеся связи.
+
+        Сигнал m2m_changed не отправляется: кэш произведений и так
+        сбрасывается сохранением произведения.
+        """
+        genres = {genre.pk: genre for genre in genres}
+        through = Title.genre.through
+        removed = current - genres.keys()
+        if removed:
+            through.objects.filter(
+                title_id=instance.pk, genre_id__in=removed
+            ).delete()
+        added = genres.keys() - current
+        if added:
+            through.objects.bulk_create(
+                through(title_id=instance.pk, genre_id=genre_id)
+                for genre_id in added
+            )
+        # Загруженные prefetch_related жанры больше не актуальны.
+        getattr(instance, '_prefetched_objects_cache', {}).pop('genre', None)
+        self.genres = sorted(genres.values(), key=attrgetter('pk'))
+
+    def create(self, validated_data):
+        genres = validated_data.pop('genre', [])
+        with transaction.atomic():
+            instance = Title.objects.create(**validated_data)
+            self.set_genres(instance, genres, current=set())
+        return instance
+
+    def update(self, instance, validated_data):
+        genres = validated_data.pop('genre', None)
+        with transaction.atomic():
+            if genres is not None:
+                # После get_object жанры уже загружены prefetch_related.
+                current = {genre.pk for genre in instance.genre.all()}
+                self.set_genres(instance, genres, current)
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            # Только изменённые поля: счётчики рейтинга меняют сигналы
+            # отзывов, их нельзя перезаписать прочитанными значениями.
+            instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
     def to_representation(self, instance):
-        serializer = TitleSerializer(instance)
-        return serializer.data
+        # Ответ строится из объектов в памяти, без запросов к БД.
+        genres = self.genres
+        if genres is None:
+            genres = sorted(instance.genre.all(), key=attrgetter('pk'))
+        category = instance.category
+        return TitleValuesSerializer.to_data(
+            {
+                'id': instance.pk,
+                'name': instance.name,
+                'year': instance.year,
+                'description': instance.description,
+                'score_sum': instance.score_sum,
+                'review_count': instance.review_count,
+            },
+            [{'name': genre.name, 'slug': genre.slug} for genre in genres],
+            (
+                None
+                if category is None
+                else {'name': category.name, 'slug': category.slug}
+            ),
+        )
+
+
+def insert_rows(cursor, table, columns, rows):
+    """Вставляет строки многострочными INSERT; возвращает id строк.
+
+    Пачки ограничены числом параметров запроса. Сигналы не
+    отправляются. В SQLite строки одного INSERT получают подряд
+    идущие id (запись в таблицу заблокирована до конца транзакции),
+    а last_insert_rowid() — id последней из них; триггеры FTS5 на
+    это значение не влияют.
+    """
+    quote_name = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES '.format(
+        quote_name(table), ', '.join(map(quote_name, columns))
+    )
+    row = '({})'.format(', '.join(['%s'] * len(columns)))
+    batch_size = connection.ops.bulk_batch_size(columns, rows)
+    pks = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        cursor.execute(
+            sql + ', '.join([row] * len(batch)),
+            [value for values in batch for value in values],
+        )
+        last = cursor.lastrowid
+        pks.extend(range(last - len(batch) + 1, last + 1))
+    return pks
+
+
+def create_titles(items):
+    """Сохраняет новые произведения из проверенных данных; возвращает id.
+
+    Без RETURNING в многострочном INSERT (SQLite в Django 3.2)
+    bulk_create не возвращает id, а они нужны для связей с жанрами,
+    поэтому строки вставляются через insert_rows, минуя экземпляры
+    моделей. Счётчики отзывов у нового произведения нулевые,
+    updated_at (auto_now) одно на всю пачку.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        titles = Title.objects.bulk_create(Title(**data) for data in items)
+        return [title.pk for title in titles]
+    updated_at = connection.ops.adapt_datetimefield_value(timezone.now())
+    rows = [
+        (
+            data['name'],
+            data['year'],
+            data.get('description'),
+            data['category'].pk if data.get('category') else None,
+            0,
+            0,
+            updated_at,
+        )
+        for data in items
+    ]
+    with connection.cursor() as cursor:
+        return insert_rows(
+            cursor,
+            Title._meta.db_table,
+            (
+                'name',
+                'year',
+                'description',
+                'category_id',
+                'score_sum',
+                'review_count',
+                'updated_at',
+            ),
+            rows,
+        )
 
 
-class RegistrationSerializer(serializers.ModelSerializer):
+class TitleBulkSerializer:
+    """Создание пачки произведений (POST /titles/bulk/).
+
+    Каждый элемент проверяет TitleCreateUpdateSerializer, как и
+    одиночный POST. Slug категорий и жанров всей пачки разрешаются
+    заранее за один проход по справочникам и передаются полям через
+    контекст. Корректные элементы и их связи с жанрами сохраняются
+    многострочными INSERT в одной транзакции, для остальных элементов
+    в результатах возвращаются ошибки.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        # Индекс элемента -> ошибки или (данные произведения, id жанров).
+        self.errors = {}
+        self.titles = {}
+        self.pks = []
+
+    def get_slugs(self, field):
+        for item in self.items:
+            value = item.get(field) if isinstance(item, dict) else None
+            values = value if isinstance(value, list) else [value]
+            yield from (slug for slug in values if isinstance(slug, str))
+
+    def is_valid(self):
+        serializer = TitleCreateUpdateSerializer(
+            context={
+                'dimension_objects': {
+                    Category: dimensions.categories.get_objects(
+                        self.get_slugs('category')
+                    ),
+                    Genre: dimensions.genres.get_objects(
+                        self.get_slugs('genre')
+                    ),
+                }
+            }
+        )
+        for index, item in enumerate(self.items):
+            try:
+                data = serializer.run_validation(item)
+            except ValidationError as error:
+                self.errors[index] = serializers.as_serializer_error(error)
+                continue
+            genres = data.pop('genre', [])
+            self.titles[index] = (data, {genre.pk for genre in genres})
+        return not self.errors
+
+    def save(self):
+        with transaction.atomic():
+            self.pks = create_titles(
+                [data for data, _ in self.titles.values()]
+            )
+            with connection.cursor() as cursor:
+                insert_rows(
+                    cursor,
+                    Title.genre.through._meta.db_table,
+                    ('title_id', 'genre_id'),
+                    [
+                        (pk, genre_id)
+                        for pk, (_, genre_ids) in zip(
+                            self.pks, self.titles.values()
+                        )
+                        for genre_id in genre_ids
+                    ],
+                )
+            # Сигналы не отправлялись, кэш сбрасываем явно.
+            bump_version('titles')
+
+    @property
+    def data(self):
+        pks = dict(zip(self.titles, self.pks))
+        results = [
+            (
+                {'errors': self.errors[index]}
+                if index in self.errors
+                else {'id': pks[index]}
+            )
+            for index in range(len(self.items))
+        ]
+        return {
+            'created': len(self.titles),
+            'failed': len(self.errors),
+            'results': results,
+        }
+
+
+class RegistrationSerializer(
+    TimedSerializerMixin, serializers.ModelSerializer
+):
     username = serializers.RegexField(
         regex=r'^[\w.@+-]+$', max_length=150, required=True
     )
+    # Пользователь с теми же username и email, найденный при валидации.
+    existing_user = None
 
     class Meta:
         model = User
@@ -121,29 +498,33 @@ class RegistrationSerializer(serializers.ModelSerializer):
     def validate(self, data):
         username = data.get('username')
         email = data.get('email')
-        if User.objects.filter(username=username, email=email).exists():
-            return data
+        # Все совпадения по username или email — одним запросом.
+        users = User.objects.filter(Q(username=username) | Q(email=email))
+        for user in users:
+            if user.username == username and user.email == email:
+                self.existing_user = user
+                return data
         if username == 'me':
             raise serializers.ValidationError('Использовать имя me запрещено')
-        if User.objects.filter(username=username).exists():
+        if any(user.username == username for user in users):
             raise serializers.ValidationError(
                 'Пользователь с такой фамилией уже существует'
             )
-        if User.objects.filter(email=email).exists():
+        if users:
             raise serializers.ValidationError(
                 'Пользователь с таким email уже существует'
             )
         return data
 
 
-class TokenSerializer(serializers.Serializer):
+class TokenSerializer(TimedSerializerMixin, serializers.Serializer):
     username = serializers.RegexField(
         regex=r'^[\w.@+-]+$', max_length=150, required=True
     )
     confirmation_code = serializers.CharField(max_length=150, required=True)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -156,7 +537,7 @@ class UserSerializer(serializers.ModelSerializer):
         )
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
@@ -169,19 +550,27 @@ class ReviewSerializer(serializers.ModelSerializer):
     def validate(self, data):
         request = self.context.get('request')
         if request.method == 'POST':
-            data['title'] = self.context.get('view').get_title()
+            data['title'] = self.context['title']
             data['author'] = request.user
-            if Review.objects.filter(
-                author=data['author'],
-                title=data['title'],
-            ).exists():
-                raise ValidationError(
-                    'На произведение можно оставить только один отзыв'
-                )
         return data
 
+    def create(self, validated_data):
+        # Дубли ловит ограничение unique_author_title: так нет лишнего
+        # запроса и нет гонки между проверкой и вставкой.
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise ValidationError(
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        'На произведение можно оставить только один отзыв'
+                    ]
+                }
+            )
+
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
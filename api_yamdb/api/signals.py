@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache import bump_version
+from api.constants import USER_CACHE_KEY
+from reviews.models import Category, Comment, Genre, Review, Title
+
+User = get_user_model()
+
+# Какие закэшированные ресурсы устаревают при изменении модели.
+# Произведения включают категорию, жанры и рейтинг из отзывов;
+# для пользователей кэшируется только их число. Версии комментариев
+# и пользователей входят в ETag комментариев и отзывов.
+DEPENDENT_RESOURCES = {
+    User: ('users',),
+    Category: ('categories', 'titles'),
+    Genre: ('genres', 'titles'),
+    Title: ('titles',),
+    Review: ('titles',),
+    Comment: ('comments',),
+}
+
+
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_version(*DEPENDENT_RESOURCES[sender])
+
+
+# Приёмник подключается только к этим моделям: приёмник post_delete
+# без sender отключил бы быстрое удаление (одним DELETE) у всех
+# остальных, например у связей произведений с жанрами.
+for model in DEPENDENT_RESOURCES:
+    post_save.connect(invalidate_catalog_cache, sender=model)
+    post_delete.connect(invalidate_catalog_cache, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, **kwargs):
+    bump_version('titles')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    cache.delete(USER_CACHE_KEY.format(user_id=instance.pk))
@@ -0,0 +1,59 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+AUTH = 'auth'
+PERMISSIONS = 'perm'
+DB = 'db'
+SERIALIZER = 'serializer'
+RENDER = 'render'
+TOTAL = 'total'
+# Порядок метрик в заголовке Server-Timing.
+PHASES = (AUTH, PERMISSIONS, DB, SERIALIZER, RENDER, TOTAL)
+
+current_timing = ContextVar('server_timing', default=None)
+
+
+class ServerTiming:
+    """Время фаз обработки запроса для заголовка Server-Timing."""
+
+    def __init__(self):
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.active = set()
+        self.descriptions = {}
+
+    def add(self, name, duration, description=None):
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+        if description is not None:
+            self.descriptions[name] = description
+
+    def header(self):
+        metrics = []
+        for name, duration in self.durations.items():
+            # Три знака (микросекунды): быстрые фазы, например auth
+            # анонимного запроса, не округляются до нуля.
+            metric = f'{name};dur={duration * 1000:.3f}'
+            if name in self.descriptions:
+                metric += f';desc="{self.descriptions[name]}"'
+            metrics.append(metric)
+        return ', '.join(metrics)
+
+
+@contextmanager
+def measure(name):
+    """Добавляет время блока к фазе текущего запроса.
+
+    Вложенные замеры одной фазы (например, вложенные сериализаторы)
+    не суммируются повторно. Вне запроса ничего не делает.
+    """
+    timing = current_timing.get()
+    if timing is None or name in timing.active:
+        yield
+        return
+    timing.active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
+        timing.active.discard(name)
@@ -8,6 +8,7 @@ from api.views import (
     ReviewViewSet,
     TitleViewSet,
     UserViewSet,
+    cache_stats,
     get_jwt_token,
     signup,
 )
@@ -31,4 +32,5 @@ urlpatterns = [
     path('v1/', include(v1_router.urls)),
     path('v1/auth/signup/', signup, name='signup'),
     path('v1/auth/token/', get_jwt_token, name='token'),
+    path('v1/cache-stats/', cache_stats, name='cache-stats'),
 ]
@@ -1,19 +1,27 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
-from django.db.models.functions import Round
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, status
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from rest_framework_simplejwt.tokens import AccessToken
 
+from api.cache import get_cache_stats, get_cached_count
 from api.filters import TitleFilter
-from api.mixins import CreateDestroyListViewSet, PublicationPermissionViewSet
+from api.mixins import (
+    CatalogCacheMixin,
+    ConditionalGetMixin,
+    CreateDestroyListViewSet,
+    PublicationPermissionViewSet,
+    ServerTimingMixin,
+    ValuesReadMixin,
+)
 from api.permissions import (
     AdminPermission,
     DisablePUTMethod,
@@ -25,12 +33,15 @@ from api.serializers import (
     GenreSerializer,
     RegistrationSerializer,
     ReviewSerializer,
+    TitleBulkSerializer,
     TitleCreateUpdateSerializer,
     TitleSerializer,
+    TitleValuesSerializer,
     TokenSerializer,
     UserSerializer,
 )
 from reviews.models import Category, Genre, Review, Title
+from roles.models import OutgoingEmail
 
 User = get_user_model()
 
@@ -40,6 +51,7 @@ class CategoryViewset(CreateDestroyListViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_resource = 'categories'
 
 
 class GenreViewSet(CreateDestroyListViewSet):
@@ -47,42 +59,108 @@ class GenreViewSet(CreateDestroyListViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_resource = 'genres'
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(
+    ServerTimingMixin,
+    CatalogCacheMixin,
+    ConditionalGetMixin,
+    ValuesReadMixin,
+    ModelViewSet,
+):
     """Вьюсет для произведений."""
 
-    queryset = Title.objects.annotate(rating=Round(Avg('reviews__score')))
+    queryset = Title.objects.select_related('category').prefetch_related(
+        Prefetch('genre', queryset=Genre.objects.order_by('pk'))
+    )
     serializer_class = TitleSerializer
+    values_serializer_class = TitleValuesSerializer
     filter_backends = (DjangoFilterBackend,)
     permission_classes = (
         DisablePUTMethod,
         OnlyAdminPostPermissons,
     )
     filterset_class = TitleFilter
+    cache_resource = 'titles'
+    etag_resources = ('titles',)
+    query_budget = 12
+    bulk_max_items = 5000
 
     def get_serializer_class(self):
         if self.action in ['create', 'partial_update']:
             return TitleCreateUpdateSerializer
         return TitleSerializer
 
+    @action(
+        methods=[
+            'post',
+        ],
+        detail=False,
+        permission_classes=[permissions.IsAuthenticated, AdminPermission],
+        # Число INSERT растёт с размером пачки, бюджет вьюсета к этому
+        # маршруту не применяется.
+        query_budget=None,
+    )
+    def bulk(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError('Ожидался непустой список произведений.')
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(
+                f'Не больше {self.bulk_max_items} произведений за запрос.'
+            )
+        serializer = TitleBulkSerializer(items)
+        if serializer.is_valid():
+            response_status = status.HTTP_201_CREATED
+        elif serializer.titles:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        if serializer.titles:
+            serializer.save()
+        return Response(serializer.data, status=response_status)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+def create_signup_user(validated_data):
+    """Создаёт пользователя, которого не нашла валидация.
+
+    Если параллельный запрос успел создать такого же пользователя,
+    срабатывает ограничение уникальности, и клиент получает 400.
+    """
+    try:
+        with transaction.atomic():
+            return User.objects.create(
+                username=validated_data['username'],
+                email=validated_data['email'],
+            )
+    except IntegrityError:
+        raise ValidationError(
+            'Пользователь с таким username или email уже существует'
+        )
+
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def signup(request):
     serializer = RegistrationSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
-    user, _ = User.objects.get_or_create(
-        username=serializer.validated_data['username'],
-        email=serializer.validated_data['email'],
-    )
-    confirmation_code = default_token_generator.make_token(user)
-    send_mail(
-        subject="Registration",
-        message=f"Verification code: {confirmation_code}",
-        from_email=None,
-        recipient_list=[user.email],
-    )
+    # Письмо только ставится в очередь, отправляет его send_queued_emails.
+    with transaction.atomic():
+        user = serializer.existing_user
+        if user is None:
+            user = create_signup_user(serializer.validated_data)
+        confirmation_code = default_token_generator.make_token(user)
+        OutgoingEmail.objects.create(
+            subject="Registration",
+            body=f"Verification code: {confirmation_code}",
+            recipient=user.email,
+        )
     return Response(data=serializer.data, status=status.HTTP_200_OK)
 
 
@@ -104,7 +182,14 @@ def get_jwt_token(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserViewSet(ModelViewSet):
+@api_view(['GET'])
+@permission_classes([AdminPermission])
+def cache_stats(request):
+    """Попадания и промахи кэша каталога в процессе, ответившем на запрос."""
+    return Response(get_cache_stats())
+
+
+class UserViewSet(ServerTimingMixin, ModelViewSet):
     lookup_field = 'username'
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -112,6 +197,10 @@ class UserViewSet(ModelViewSet):
     filter_backends = (DjangoFilterBackend, SearchFilter)
     filterset_fields = ['username']
     search_fields = ['username']
+    query_budget = 5
+
+    def get_count_estimate(self):
+        return get_cached_count('users', self.get_queryset())
 
     @action(
         methods=[
@@ -170,26 +259,66 @@ class UserViewSet(ModelViewSet):
 
 class ReviewViewSet(PublicationPermissionViewSet):
     serializer_class = ReviewSerializer
+    etag_resources = ('users',)
 
     def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+        # Вьюсет создаётся на каждый запрос, так что произведение
+        # запрашивается из БД не больше одного раза за запрос.
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.select_related('author')
+
+    def get_count_estimate(self):
+        # Счётчик поддерживают сигналы отзывов.
+        return self.get_title().review_count
+
+    def get_etag_parts(self, request):
+        # Сигналы отзывов обновляют счётчик и updated_at произведения
+        # при любом изменении его отзывов.
+        title = self.get_title()
+        return super().get_etag_parts(request) + [
+            title.review_count,
+            title.updated_at,
+        ]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['title'] = self.get_title()
+        return context
 
 
 class CommentViewSet(PublicationPermissionViewSet):
     serializer_class = CommentSerializer
+    etag_resources = ('comments', 'users')
 
     def get_review(self):
-        return get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id'),
-            title__id=self.kwargs.get('title_id'),
-        )
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                pk=self.kwargs.get('review_id'),
+                title__id=self.kwargs.get('title_id'),
+            )
+        return self._review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return self.get_review().comments.select_related('author')
+
+    def get_etag_parts(self, request):
+        # Отзыв запрашивается и для проверки условного запроса: после
+        # удаления отзыва старый ETag не должен давать 304 вместо 404.
+        return super().get_etag_parts(request) + [
+            self.get_review().updated_at
+        ]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['review'] = self.get_review()
+        return context
 
     def perform_create(self, serializer):
         serializer.save(review=self.get_review(), author=self.request.user)
@@ -25,6 +25,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.ServerTimingMiddleware',
+    'api.middleware.ProfilerMiddleware',
+    'api.middleware.QueryBudgetMiddleware',
+    'api.middleware.CatalogVersionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -98,12 +102,49 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.TimedJSONRenderer',
+        'api.renderers.TimedBrowsableAPIRenderer',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 10,
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Ответы каталога. LocMemCache вытесняет давно не читавшиеся ключи
+    # (LRU) при превышении MAX_ENTRIES. Кэш у каждого процесса свой,
+    # но ключи строятся по общим версиям ресурсов (reviews.CatalogVersion).
+    'catalog': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'catalog',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+CATALOG_CACHE_ALIAS = 'catalog'
+
+# Подсчёт SQL-запросов на запрос и контроль query_budget вьюсетов.
+QUERY_BUDGET_ENABLED = DEBUG
+QUERY_BUDGET_RAISE = False
+
+# Заголовок Server-Timing с временем фаз обработки запроса. Раскрывает
+# детали обработки запроса, поэтому по умолчанию только при DEBUG.
+SERVER_TIMING_ENABLED = DEBUG
+
+# Выборочное профилирование: каждый N-й запрос (0 — только по
+# заголовку X-Profile от администратора). Отчёт — profile_report.
+PROFILER_ENABLED = False
+PROFILER_SAMPLE_RATE = 100
+PROFILER_HEADER = 'HTTP_X_PROFILE'
+PROFILER_DIR = BASE_DIR / 'profiles'
+PROFILER_MAX_FILES = 100
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 SIMPLE_JWT = {
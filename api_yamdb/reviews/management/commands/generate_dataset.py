@@ -0,0 +1,311 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from math import fsum
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from api.cache import bump_version
+from reviews.management.commands.load_initial_data import (
+    DEFAULT_USER_PASSWORD,
+)
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.utils import recalculate_title_ratings
+from roles.models import UserRole
+
+User = get_user_model()
+
+BATCH_SIZE = 5000
+# Отсчёт дат публикации: данные не зависят от момента запуска.
+START_DATE = datetime(2015, 1, 1, tzinfo=timezone.utc)
+DATE_RANGE_SECONDS = 10 * 365 * 24 * 60 * 60
+MAX_GENRES_PER_TITLE = 3
+
+
+@contextmanager
+def fixed_dates(*models):
+    """Отключает auto_now/auto_now_add, чтобы сохранить заданные даты."""
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def zipf_counts(total, size, exponent):
+    """Делит total на size частей по закону Ципфа (первая — самая большая).
+
+    Распределение детерминированное: дробные остатки отдаются самым
+    популярным позициям.
+    """
+    weights = [1 / rank ** exponent for rank in range(1, size + 1)]
+    weights_sum = sum(weights)
+    counts = [int(total * weight / weights_sum) for weight in weights]
+    for index in range(total - sum(counts)):
+        counts[index % size] += 1
+    return counts
+
+
+class Command(BaseCommand):
+    help = 'Генерация синтетического набора данных для нагрузочных тестов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--titles', type=int, default=500)
+        parser.add_argument('--reviews', type=int, default=20000)
+        parser.add_argument('--comments', type=int, default=50000)
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель распределения популярности произведений.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def next_id(self, model):
+        return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+    def random_date(self):
+        return START_DATE + timedelta(
+            seconds=self.rng.randrange(DATE_RANGE_SECONDS)
+        )
+
+    def insert(self, label, model, objects):
+        """Вставляет объекты из генератора пачками в одной транзакции."""
+        started = time.perf_counter()
+        total = 0
+        batch = []
+        with transaction.atomic():
+            for obj in objects:
+                batch.append(obj)
+                if len(batch) >= self.batch_size:
+                    model.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+            model.objects.bulk_create(batch)
+            total += len(batch)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{label}: {total} строк за {elapsed:.2f} с '
+            f'({total / elapsed if elapsed else total:.0f} строк/с)'
+        )
+
+    def generate_users(self, first_id, count):
+        password = make_password(DEFAULT_USER_PASSWORD)
+        roles = (UserRole.USER, UserRole.MODERATOR, UserRole.ADMIN)
+        for user_id in range(first_id, first_id + count):
+            yield User(
+                id=user_id,
+                username=f'user{user_id}',
+                email=f'user{user_id}@yamdb.fake',
+                password=password,
+                role=self.rng.choices(roles, weights=(97, 2.5, 0.5))[0],
+            )
+
+    def generate_names(self, model, first_id, count, prefix):
+        for object_id in range(first_id, first_id + count):
+            yield model(
+                id=object_id,
+                name=f'{prefix} {object_id}',
+                slug=f'{model._meta.model_name}-{object_id}',
+            )
+
+    def generate_titles(self, first_id, count, category_ids):
+        category_weights = list(
+            accumulate(zipf_counts(1000, len(category_ids), 1))
+        )
+        for title_id in range(first_id, first_id + count):
+            yield Title(
+                id=title_id,
+                name=f'Произведение {title_id}',
+                year=self.rng.randint(1950, START_DATE.year + 9),
+                category_id=self.rng.choices(
+                    category_ids, cum_weights=category_weights
+                )[0],
+                description=f'Описание произведения {title_id}',
+                updated_at=self.random_date(),
+            )
+
+    def generate_title_genres(self, title_ids, genre_ids):
+        """Жанры произведения: первый по Ципфу, остальные — соседние.
+
+        Соседние по номеру жанры выпадают вместе чаще, что даёт
+        устойчивые пары вроде «боевик + триллер».
+        """
+        through = Title.genre.through
+        genre_weights = list(accumulate(zipf_counts(1000, len(genre_ids), 1)))
+        for title_id in title_ids:
+            first = self.rng.choices(
+                range(len(genre_ids)), cum_weights=genre_weights
+            )[0]
+            chosen = {first}
+            for _ in range(self.rng.randint(0, MAX_GENRES_PER_TITLE - 1)):
+                offset = self.rng.choice((-2, -1, 1, 1, 2))
+                chosen.add((first + offset) % len(genre_ids))
+            for index in sorted(chosen):
+                yield through(title_id=title_id, genre_id=genre_ids[index])
+
+    def generate_reviews(self, first_id, title_ids, counts, user_ids):
+        """Отзывы по произведениям; автор не повторяется в пределах одного."""
+        review_id = first_id
+        for title_id, count in zip(title_ids, counts):
+            quality = self.rng.gauss(6.5, 1.5)
+            for author_id in self.rng.sample(user_ids, count):
+                pub_date = self.random_date()
+                yield Review(
+                    id=review_id,
+                    title_id=title_id,
+                    author_id=author_id,
+                    text=f'Отзыв {review_id}',
+                    score=min(10, max(1, round(self.rng.gauss(quality, 2)))),
+                    pub_date=pub_date,
+                    updated_at=pub_date,
+                )
+                review_id += 1
+
+    def exponential_counts(self, total, size):
+        """Делит total на size частей по экспоненциальному распределению.
+
+        Части отдаются по одной, память не зависит от size: выборка
+        генерируется дважды из одного зерна — для суммы и для частей.
+        Границы частей — округлённые накопленные доли, так что каждая
+        часть отличается от своей доли меньше чем на 1, а сумма частей
+        равна total.
+        """
+        seed = self.rng.getrandbits(64)
+        rng = random.Random(seed)
+        scale = total / fsum(rng.expovariate(1) for _ in range(size))
+        rng.seed(seed)
+        cumulative = 0.0
+        assigned = 0
+        for _ in range(size - 1):
+            cumulative += rng.expovariate(1)
+            boundary = min(round(cumulative * scale), total)
+            yield boundary - assigned
+            assigned = boundary
+        yield total - assigned
+
+    def generate_comments(self, first_id, review_ids, total, user_ids):
+        """Комментарии по экспоненциальному распределению на отзыв."""
+        if not total or not review_ids:
+            return
+        comment_id = first_id
+        counts = self.exponential_counts(total, len(review_ids))
+        for review_id, count in zip(review_ids, counts):
+            for _ in range(count):
+                pub_date = self.random_date()
+                yield Comment(
+                    id=comment_id,
+                    review_id=review_id,
+                    author_id=self.rng.choice(user_ids),
+                    text=f'Комментарий {comment_id}',
+                    pub_date=pub_date,
+                    updated_at=pub_date,
+                )
+                comment_id += 1
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+
+        first_user = self.next_id(User)
+        self.insert(
+            'users',
+            User,
+            self.generate_users(first_user, options['users']),
+        )
+        user_ids = range(first_user, first_user + options['users'])
+
+        first_category = self.next_id(Category)
+        self.insert(
+            'categories',
+            Category,
+            self.generate_names(
+                Category, first_category, options['categories'], 'Категория'
+            ),
+        )
+        first_genre = self.next_id(Genre)
+        self.insert(
+            'genres',
+            Genre,
+            self.generate_names(
+                Genre, first_genre, options['genres'], 'Жанр'
+            ),
+        )
+        category_ids = range(
+            first_category, first_category + options['categories']
+        )
+        genre_ids = range(first_genre, first_genre + options['genres'])
+
+        first_title = self.next_id(Title)
+        title_ids = range(first_title, first_title + options['titles'])
+        with fixed_dates(Title, Review, Comment):
+            self.insert(
+                'titles',
+                Title,
+                self.generate_titles(
+                    first_title, options['titles'], category_ids
+                ),
+            )
+            self.insert(
+                'genre_title',
+                Title.genre.through,
+                self.generate_title_genres(title_ids, genre_ids),
+            )
+
+            # Популярность произведений — по Ципфу в случайном порядке,
+            # отзывов на произведение не больше, чем пользователей.
+            counts = zipf_counts(
+                options['reviews'], len(title_ids), options['zipf']
+            )
+            self.rng.shuffle(counts)
+            counts = [min(count, len(user_ids)) for count in counts]
+            if sum(counts) < options['reviews']:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f'reviews: будет создано {sum(counts)} из '
+                        f'{options["reviews"]}: на произведение не больше '
+                        'отзывов, чем пользователей.'
+                    )
+                )
+            first_review = self.next_id(Review)
+            self.insert(
+                'reviews',
+                Review,
+                self.generate_reviews(
+                    first_review, title_ids, counts, user_ids
+                ),
+            )
+            review_ids = range(first_review, first_review + sum(counts))
+            self.insert(
+                'comments',
+                Comment,
+                self.generate_comments(
+                    self.next_id(Comment),
+                    review_ids,
+                    options['comments'],
+                    user_ids,
+                ),
+            )
+
+        recalculate_title_ratings(Title.objects.filter(pk__gte=first_title))
+        bump_version('categories', 'comments', 'genres', 'titles', 'users')
@@ -1,10 +1,16 @@
 import csv
+import time
+from itertools import islice
 from pathlib import Path
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
+from api.cache import RESOURCES, bump_version
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.utils import recalculate_title_ratings
 
 User = get_user_model()
 
@@ -15,6 +21,13 @@ STATIC_DIR = BASE_DIR.joinpath('static', 'data')
 
 USER_FILE = 'users.csv'
 DEFAULT_USER_PASSWORD = 'qwerty1'
+BATCH_SIZE = 1000
+
+# Режимы паролей импортируемых пользователей.
+PASSWORD_SHARED = 'shared'
+PASSWORD_UNUSABLE = 'unusable'
+PASSWORD_PER_USER = 'per-user'
+PASSWORD_MODES = (PASSWORD_SHARED, PASSWORD_UNUSABLE, PASSWORD_PER_USER)
 
 DATA_SOURCES = {
     Category: 'category.csv',
@@ -62,57 +75,96 @@ DATA_MAPPING = {
 class Command(BaseCommand):
     help = 'Импорт данных.'
 
-    def create_users(self):
-        model_name = User
-        file_path = STATIC_DIR.joinpath(USER_FILE)
-
-        model_name.objects.all().delete()
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--passwords',
+            choices=PASSWORD_MODES,
+            default=PASSWORD_SHARED,
+            help=(
+                'shared — один хэш пароля по умолчанию на всех, '
+                'unusable — вход по паролю запрещён, '
+                'per-user — отдельный хэш для каждого пользователя.'
+            ),
+        )
+
+    def read_batches(self, file_name, mapping=None):
+        """Построчно читает csv и отдаёт строки пачками по BATCH_SIZE."""
+        file_path = STATIC_DIR.joinpath(file_name)
         with open(file_path, encoding='utf8', mode='r', newline='') as f_n:
-
-            reader = csv.DictReader(f_n)
-            for row in reader:
-                User.objects.create_user(
-                    id=row.get('id'),
-                    username=row.get('username'),
-                    email=row.get('email'),
-                    password=DEFAULT_USER_PASSWORD,
-                    role=row.get('role'),
-                    bio=row.get('bio'),
-                    first_name=row.get('first_name'),
-                    last_name=row.get('last_name'),
+            reader = csv.reader(f_n)
+            headers = next(reader)
+            if mapping is not None:
+                headers = [mapping[item] for item in headers]
+            rows = (dict(zip(headers, row)) for row in reader)
+            batch = list(islice(rows, BATCH_SIZE))
+            while batch:
+                yield batch
+                batch = list(islice(rows, BATCH_SIZE))
+
+    def load_file(self, file_name, model, build, mapping=None):
+        """Заменяет строки модели данными файла в одной транзакции.
+
+        Старые строки удаляются в той же транзакции, что и загрузка
+        пачками bulk_create: при ошибке в файле таблица не остаётся
+        пустой.
+        """
+        started = time.perf_counter()
+        total = 0
+        with transaction.atomic():
+            model.objects.all().delete()
+            for batch in self.read_batches(file_name, mapping):
+                model.objects.bulk_create(
+                    [build(row) for row in batch], batch_size=BATCH_SIZE
                 )
+                total += len(batch)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{file_name}: {total} строк за {elapsed:.2f} с '
+            f'({total / elapsed if elapsed else total:.0f} строк/с)'
+        )
+
+    def get_password_builder(self, mode):
+        """Возвращает функцию, выдающую значение поля password.
+
+        PBKDF2 специально медленный, поэтому в режимах shared и unusable
+        хэш вычисляется один раз на весь импорт.
+        """
+        if mode == PASSWORD_PER_USER:
+            return lambda: make_password(DEFAULT_USER_PASSWORD)
+        password = make_password(
+            DEFAULT_USER_PASSWORD if mode == PASSWORD_SHARED else None
+        )
+        return lambda: password
+
+    def create_users(self, password_mode=PASSWORD_SHARED):
+        build_password = self.get_password_builder(password_mode)
+        self.load_file(
+            USER_FILE,
+            User,
+            lambda row: User(password=build_password(), **row),
+        )
 
     def genre_title_matching(self):
-        title_id = 'title_id'
-        genre_id = 'genre_id'
-
-        file_path = STATIC_DIR.joinpath(GENRE_TITLE_FILE)
-        with open(file_path, encoding='utf8', mode='r') as f_n:
-            reader = csv.DictReader(f_n)
-
-            for row in reader:
-                title = Title.objects.get(pk=row.get(title_id))
-                genre = Genre.objects.get(pk=row.get(genre_id))
-                title.genre.add(genre)
+        through = Title.genre.through
+        self.load_file(
+            GENRE_TITLE_FILE,
+            through,
+            lambda row: through(
+                title_id=row['title_id'], genre_id=row['genre_id']
+            ),
+        )
 
     def handle(self, *args, **kwargs):
-        self.create_users()
+        self.create_users(kwargs['passwords'])
         for model, file_name in DATA_SOURCES.items():
+            self.load_file(
+                file_name,
+                model,
+                lambda row, model=model: model(**row),
+                DATA_MAPPING[model],
+            )
 
-            file_path = STATIC_DIR.joinpath(file_name)
-            with open(file_path, encoding='utf8', mode='r') as f_n:
-
-                headers_str = f_n.readline().rstrip('\n')
-                headers_list = headers_str.split(',')
-                field_names = [
-                    DATA_MAPPING[model][item] for item in headers_list
-                ]
-
-                reader = csv.DictReader(f_n, fieldnames=field_names)
-                model.objects.all().delete()
-                data = [model(**row) for row in reader]
-
-                model.objects.bulk_create(data)
-
-        self.genre_title_matching()
         self.genre_title_matching()
+        # bulk_create не отправляет сигналы, счётчики считаем явно.
+        recalculate_title_ratings()
+        bump_version(*RESOURCES)
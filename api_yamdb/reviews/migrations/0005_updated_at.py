@@ -0,0 +1,34 @@
+# Generated by Django 3.2 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_review_comment_pub_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=models.DateTimeField(
+                auto_now=True, verbose_name='Дата изменения'
+            ),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='updated_at',
+            field=models.DateTimeField(
+                auto_now=True, verbose_name='Дата изменения'
+            ),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='updated_at',
+            field=models.DateTimeField(
+                auto_now=True, verbose_name='Дата изменения'
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# Внешний (external content) индекс FTS5: сами тексты хранятся только в
+# reviews_title, индекс поддерживается триггерами.
+CREATE_FTS = (
+    "CREATE VIRTUAL TABLE reviews_title_fts USING fts5("
+    "name, description, content='reviews_title', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER reviews_title_fts_ai AFTER INSERT ON reviews_title "
+    "BEGIN "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); "
+    "END",
+    "CREATE TRIGGER reviews_title_fts_ad AFTER DELETE ON reviews_title "
+    "BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    "END",
+    "CREATE TRIGGER reviews_title_fts_au "
+    "AFTER UPDATE OF name, description ON reviews_title "
+    "BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); "
+    "END",
+    "INSERT INTO reviews_title_fts(reviews_title_fts) VALUES ('rebuild')",
+)
+
+DROP_FTS = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_au',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ad',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ai',
+    'DROP TABLE IF EXISTS reviews_title_fts',
+)
+
+
+def execute_on_sqlite(schema_editor, statements):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_fts(apps, schema_editor):
+    execute_on_sqlite(schema_editor, CREATE_FTS)
+
+
+def drop_fts(apps, schema_editor):
+    execute_on_sqlite(schema_editor, DROP_FTS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
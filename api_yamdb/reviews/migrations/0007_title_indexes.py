@@ -0,0 +1,105 @@
+# Generated by Django 3.2 on 2026-10-18 20:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# AlterField на SQLite пересоздаёт таблицу, а вместе с reviews_title
+# удаляются и триггеры FTS5 из 0006. Их создают заново после AlterField
+# в обе стороны миграции. Сам индекс FTS5 не меняется: id строк при
+# пересоздании таблицы сохраняются.
+DROP_FTS_TRIGGERS = (
+    'DROP TRIGGER IF EXISTS reviews_title_fts_au',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ad',
+    'DROP TRIGGER IF EXISTS reviews_title_fts_ai',
+)
+CREATE_FTS_TRIGGERS = (
+    "CREATE TRIGGER reviews_title_fts_ai AFTER INSERT ON reviews_title "
+    "BEGIN "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); "
+    "END",
+    "CREATE TRIGGER reviews_title_fts_ad AFTER DELETE ON reviews_title "
+    "BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    "END",
+    "CREATE TRIGGER reviews_title_fts_au "
+    "AFTER UPDATE OF name, description ON reviews_title "
+    "BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); "
+    "END",
+)
+
+
+def restore_fts_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_FTS_TRIGGERS + CREATE_FTS_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_fts'),
+    ]
+
+    # Индексы внешних ключей стали первыми колонками составных индексов.
+    operations = [
+        # При откате триггеры восстанавливаются после обратных AlterField.
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.AlterField(
+            model_name='comment',
+            name='review',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name='comments',
+                to='reviews.review',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='title',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name='reviews',
+                to='reviews.title',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='category',
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='titles',
+                to='reviews.category',
+            ),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(
+                fields=['year', 'updated_at'], name='title_year_updated_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(
+                fields=['name', 'updated_at'], name='title_name_updated_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(
+                fields=['category', 'updated_at'],
+                name='title_category_updated_idx',
+            ),
+        ),
+    ]
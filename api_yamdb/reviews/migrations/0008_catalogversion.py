@@ -0,0 +1,35 @@
+# Generated by Django 3.2 on 2026-10-18 20:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                (
+                    'resource',
+                    models.CharField(
+                        max_length=32,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='Ресурс',
+                    ),
+                ),
+                (
+                    'version',
+                    models.CharField(max_length=32, verbose_name='Версия'),
+                ),
+            ],
+            options={
+                'verbose_name': 'версия каталога',
+                'verbose_name_plural': 'Версии каталога',
+            },
+        ),
+    ]
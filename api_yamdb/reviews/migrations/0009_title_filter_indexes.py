@@ -0,0 +1,57 @@
+# Generated by Django 3.2 on 2026-10-18 21:26
+
+from importlib import import_module
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# AlterField на SQLite пересоздаёт reviews_title вместе с триггерами
+# FTS5, поэтому они восстанавливаются так же, как в 0007.
+restore_fts_triggers = import_module(
+    'reviews.migrations.0007_title_indexes'
+).restore_fts_triggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_catalogversion'),
+    ]
+
+    # updated_at меняется при каждом изменении отзывов произведения,
+    # поэтому в индексах фильтров его нет.
+    operations = [
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_year_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_name_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='title',
+            name='title_category_updated_idx',
+        ),
+        # При откате триггеры восстанавливаются после обратного AlterField.
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.AlterField(
+            model_name='title',
+            name='category',
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='titles',
+                to='reviews.category',
+            ),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year'], name='title_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['name'], name='title_name_idx'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from reviews.constants import NAME_MAX_LENGTH, SLUG_MAX_LENGTH
 from reviews.validators import title_year_validation
@@ -40,18 +40,46 @@ class Title(models.Model):
     name = models.CharField('Название', max_length=NAME_MAX_LENGTH)
     year = models.IntegerField('Год', validators=[title_year_validation])
     category = models.ForeignKey(
-        Category, on_delete=models.SET_NULL, related_name='titles', null=True
+        Category,
+        on_delete=models.SET_NULL,
+        related_name='titles',
+        null=True,
     )
     genre = models.ManyToManyField(Genre)
     description = models.TextField('Описание', null=True, blank=True)
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок', default=0, editable=False
+    )
+    review_count = models.PositiveIntegerField(
+        'Количество отзывов', default=0, editable=False
+    )
+    updated_at = models.DateTimeField('Дата изменения', auto_now=True)
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        # Индексы фильтров TitleFilter; по категории фильтрует
+        # обычный индекс внешнего ключа. updated_at в индексы не входит:
+        # он меняется при каждом изменении отзывов произведения.
+        indexes = (
+            models.Index(fields=('year',), name='title_year_idx'),
+            models.Index(fields=('name',), name='title_name_idx'),
+        )
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        return self.calculate_rating(self.score_sum, self.review_count)
+
+    @staticmethod
+    def calculate_rating(score_sum, review_count):
+        """Средняя оценка, округлённая до целого (половина — вверх)."""
+        if not review_count:
+            return None
+        return (2 * score_sum + review_count) // (2 * review_count)
+
 
 class BasePublicationModel(models.Model):
     text = models.TextField('Текст')
@@ -59,6 +87,7 @@ class BasePublicationModel(models.Model):
         User, on_delete=models.CASCADE, related_name='%(class)s'
     )
     pub_date = models.DateTimeField('Дата публикации', auto_now_add=True)
+    updated_at = models.DateTimeField('Дата изменения', auto_now=True)
 
     class Meta:
         abstract = True
@@ -72,8 +101,10 @@ class Review(BasePublicationModel):
             MaxValueValidator(10, 'Оценка не может быть больше чем 10'),
         ),
     )
+    # Отдельный индекс по title не нужен: это первая колонка
+    # review_title_pub_date_idx.
     title = models.ForeignKey(
-        Title, on_delete=models.CASCADE, related_name='reviews'
+        Title, on_delete=models.CASCADE, related_name='reviews', db_index=False
     )
 
     class Meta:
@@ -84,19 +115,69 @@ class Review(BasePublicationModel):
                 fields=('author', 'title'), name='unique_author_title'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx',
+            ),
+        )
+
+    # Оценка в том виде, в каком она была загружена из БД. Нужна
+    # сигналам, чтобы скорректировать сумму оценок произведения.
+    _loaded_score = None
 
     def __str__(self):
         return f'{self.title.name} - {self.score}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = dict(zip(field_names, values)).get('score')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Отзыв и счётчики произведения обновляются в одной транзакции.
+        # Точка сохранения не нужна: ошибка всё равно пробрасывается.
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
 
 class Comment(BasePublicationModel):
+    # Индекс по review — первая колонка comment_review_pub_date_idx.
     review = models.ForeignKey(
-        Review, on_delete=models.CASCADE, related_name='comments'
+        Review,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        db_index=False,
     )
 
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text
+
+
+class CatalogVersion(models.Model):
+    """Версия ресурса каталога, общая для всех процессов API.
+
+    Ключи закэшированных ответов строятся по версии, поэтому её смена
+    в одном процессе сбрасывает кэш ответов во всех.
+    """
+
+    resource = models.CharField('Ресурс', max_length=32, primary_key=True)
+    version = models.CharField('Версия', max_length=32)
+
+    class Meta:
+        verbose_name = 'версия каталога'
+        verbose_name_plural = 'Версии каталога'
+
+    def __str__(self):
+        return f'{self.resource}: {self.version}'
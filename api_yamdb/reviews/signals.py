@@ -0,0 +1,40 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from reviews.models import Review, Title
+from reviews.utils import recalculate_title_ratings
+
+
+def change_title_score(title_id, score_delta, count_delta=0):
+    Title.objects.filter(pk=title_id).update(
+        score_sum=F('score_sum') + score_delta,
+        review_count=F('review_count') + count_delta,
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or (not created and instance._loaded_score is None):
+        # Прежняя оценка неизвестна — считаем произведение заново.
+        recalculate_title_ratings(Title.objects.filter(pk=instance.title_id))
+    elif created:
+        change_title_score(instance.title_id, instance.score, 1)
+    else:
+        # Разница оценок бывает нулевой, но updated_at произведения
+        # входит в ETag списка отзывов и должен обновиться.
+        change_title_score(
+            instance.title_id, instance.score - instance._loaded_score
+        )
+    instance._loaded_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    # Срабатывает и при каскадном удалении автора или произведения.
+    score = instance._loaded_score
+    if score is None:
+        score = instance.score
+    change_title_score(instance.title_id, -score, -1)
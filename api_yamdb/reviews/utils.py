@@ -0,0 +1,31 @@
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from reviews.models import Review, Title
+
+
+def recalculate_title_ratings(titles=None):
+    """Пересчитывает сумму оценок и число отзывов по таблице отзывов.
+
+    Нужна там, где сигналы не срабатывают: после bulk_create и загрузки
+    фикстур.
+    """
+    if titles is None:
+        titles = Title.objects.all()
+    reviews = (
+        Review.objects.filter(title=OuterRef('pk'))
+        .order_by()
+        .values('title')
+    )
+    titles.update(
+        score_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0,
+        ),
+        review_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('pk')).values('total')),
+            0,
+        ),
+        updated_at=timezone.now(),
+    )
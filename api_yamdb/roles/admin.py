@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin
 
 from .constants import LIST_PER_PAGE
+from .models import OutgoingEmail
 
 User = get_user_model()
 
@@ -24,3 +25,16 @@ class UserAdmin(admin.ModelAdmin):
     search_fields = ('username', 'email', 'role')
     list_editable = ('role',)
     list_per_page = LIST_PER_PAGE
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient',
+        'subject',
+        'created_at',
+        'attempts',
+        'sent_at',
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
@@ -1 +1,10 @@
 ﻿LIST_PER_PAGE = 10
+
+# Очередь исходящих писем.
+EMAIL_BATCH_SIZE = 100
+EMAIL_MAX_ATTEMPTS = 5
+# Задержка перед повтором, удваивается с каждой попыткой (секунды).
+EMAIL_RETRY_DELAY = 60
+# Сколько секунд захваченная пачка писем не выдаётся другим процессам.
+# Если процесс упал, неотправленные письма вернутся в очередь.
+EMAIL_CLAIM_TIMEOUT = 10 * 60
@@ -0,0 +1,116 @@
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from roles.constants import (
+    EMAIL_BATCH_SIZE,
+    EMAIL_CLAIM_TIMEOUT,
+    EMAIL_MAX_ATTEMPTS,
+    EMAIL_RETRY_DELAY,
+)
+from roles.models import OutgoingEmail
+
+UPDATED_FIELDS = ('attempts', 'next_attempt_at', 'sent_at', 'last_error')
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=EMAIL_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а ждать новые письма.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между опросами пустой очереди в секундах.',
+        )
+
+    def claim(self, batch_size):
+        """Захватывает пачку писем одним UPDATE и возвращает её.
+
+        Захваченные письма откладываются на EMAIL_CLAIM_TIMEOUT, так что
+        параллельный процесс их не выберет. Условия выборки повторяются
+        во внешнем WHERE: строку, которую уже захватил другой процесс,
+        UPDATE пропустит.
+        """
+        now = timezone.now()
+        token = uuid4()
+        pending = OutgoingEmail.objects.filter(
+            sent_at__isnull=True,
+            attempts__lt=EMAIL_MAX_ATTEMPTS,
+            next_attempt_at__lte=now,
+        )
+        batch = pending.order_by('next_attempt_at', 'id').values('pk')
+        pending.filter(pk__in=batch[:batch_size]).update(
+            claim_token=token,
+            next_attempt_at=now + timedelta(seconds=EMAIL_CLAIM_TIMEOUT),
+        )
+        return list(
+            OutgoingEmail.objects.filter(claim_token=token).order_by('id')
+        )
+
+    def mark_failed(self, email, error):
+        email.attempts += 1
+        email.last_error = str(error)
+        email.next_attempt_at = timezone.now() + timedelta(
+            seconds=EMAIL_RETRY_DELAY * 2 ** (email.attempts - 1)
+        )
+
+    def send(self, email, connection):
+        try:
+            EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=[email.recipient],
+                connection=connection,
+            ).send()
+        except Exception as error:
+            self.mark_failed(email, error)
+        else:
+            email.sent_at = timezone.now()
+        # Результат сохраняется сразу: если процесс упадёт посреди
+        # пачки, уже отправленные письма не уйдут повторно.
+        email.save(update_fields=UPDATED_FIELDS)
+
+    def send_batch(self, batch_size):
+        """Отправляет пачку писем через одно соединение с SMTP."""
+        emails = self.claim(batch_size)
+        if not emails:
+            return 0
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            for email in emails:
+                self.mark_failed(email, error)
+            OutgoingEmail.objects.bulk_update(emails, UPDATED_FIELDS)
+        else:
+            try:
+                for email in emails:
+                    self.send(email, connection)
+            finally:
+                connection.close()
+        sent = sum(email.sent_at is not None for email in emails)
+        self.stdout.write(f'Отправлено {sent} из {len(emails)} писем.')
+        return len(emails)
+
+    def handle(self, *args, **options):
+        while True:
+            processed = self.send_batch(options['batch_size'])
+            if processed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,90 @@
+# Generated by Django 3.2 on 2026-10-18 19:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('roles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'subject',
+                    models.CharField(max_length=255, verbose_name='Тема'),
+                ),
+                ('body', models.TextField(verbose_name='Текст')),
+                (
+                    'from_email',
+                    models.CharField(
+                        blank=True,
+                        max_length=254,
+                        null=True,
+                        verbose_name='Отправитель',
+                    ),
+                ),
+                (
+                    'recipient',
+                    models.EmailField(
+                        max_length=254, verbose_name='Получатель'
+                    ),
+                ),
+                (
+                    'created_at',
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name='Дата создания'
+                    ),
+                ),
+                (
+                    'attempts',
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name='Попыток отправки'
+                    ),
+                ),
+                (
+                    'next_attempt_at',
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name='Следующая попытка',
+                    ),
+                ),
+                (
+                    'sent_at',
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name='Дата отправки'
+                    ),
+                ),
+                (
+                    'last_error',
+                    models.TextField(
+                        blank=True, verbose_name='Последняя ошибка'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(
+                fields=['sent_at', 'next_attempt_at'],
+                name='outgoing_email_pending_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2 on 2026-10-18 21:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('roles', '0002_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='claim_token',
+            field=models.UUIDField(
+                blank=True,
+                db_index=True,
+                null=True,
+                verbose_name='Метка захвата',
+            ),
+        ),
+    ]
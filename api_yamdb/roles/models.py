@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
 from django.db import models
+from django.utils import timezone
 
 
 class UserRole:
@@ -67,3 +68,42 @@ class User(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == UserRole.MODERATOR
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку.
+
+    Запрос только сохраняет строку, отправкой занимается команда
+    send_queued_emails.
+    """
+
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    from_email = models.CharField(
+        'Отправитель', max_length=254, blank=True, null=True
+    )
+    recipient = models.EmailField('Получатель', max_length=254)
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField('Попыток отправки', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    sent_at = models.DateTimeField('Дата отправки', blank=True, null=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    # Метка пачки, захваченной процессом send_queued_emails.
+    claim_token = models.UUIDField(
+        'Метка захвата', blank=True, null=True, db_index=True
+    )
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'next_attempt_at'),
+                name='outgoing_email_pending_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
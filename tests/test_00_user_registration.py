@@ -1,7 +1,9 @@
 from http import HTTPStatus
+from io import StringIO
 
 import pytest
 from django.core import mail
+from django.core.management import call_command
 from django.db.utils import IntegrityError
 
 from tests.utils import (
@@ -112,6 +114,7 @@ class Test00UserRegistration:
         }
 
         response = client.post(self.URL_SIGNUP, data=valid_data)
+        call_command('send_queued_emails', stdout=StringIO())
         outbox_after = mail.outbox  # email outbox after user create
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
@@ -161,6 +164,7 @@ class Test00UserRegistration:
         response = admin_client.post(
             self.URL_ADMIN_CREATE_USER, data=valid_data
         )
+        call_command('send_queued_emails', stdout=StringIO())
         outbox_after = mail.outbox
 
         assert response.status_code != HTTPStatus.NOT_FOUND, (
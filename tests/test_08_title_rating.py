@@ -0,0 +1,52 @@
+import pytest
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def test_01_rating_follows_reviews(self, admin_client, user_client,
+                                       moderator_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/'
+        create_single_review(user_client, title_id, 'Хорошо', 6)
+        response = create_single_review(
+            moderator_client, title_id, 'Плохо', 3
+        )
+        title = Title.objects.get(pk=title_id)
+        assert (title.score_sum, title.review_count) == (9, 2), (
+            'Проверьте, что при создании отзыва обновляются счётчики '
+            'произведения.'
+        )
+        assert admin_client.get(url).json()['rating'] == 5, (
+            'Проверьте, что рейтинг округляется так же, как `Round(Avg())`.'
+        )
+
+        review_url = (
+            f'/api/v1/titles/{title_id}/reviews/{response.json()["id"]}/'
+        )
+        moderator_client.patch(review_url, data={'score': 10})
+        title.refresh_from_db()
+        assert title.score_sum == 16, (
+            'Проверьте, что при изменении оценки обновляется сумма оценок '
+            'произведения.'
+        )
+
+        moderator_client.delete(review_url)
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count) == (6, 1), (
+            'Проверьте, что при удалении отзыва обновляются счётчики '
+            'произведения.'
+        )
+
+        user.delete()
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count) == (0, 0), (
+            'Проверьте, что каскадное удаление отзывов вместе с автором '
+            'обновляет счётчики произведения.'
+        )
+        assert admin_client.get(url).json()['rating'] is None
+        assert not Review.objects.exists()
@@ -0,0 +1,122 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09Queries:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_titles_list_query_count(self, client,
+                                        django_assert_num_queries):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genres = [
+            Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+            for i in range(3)
+        ]
+        for i in range(30):
+            title = Title.objects.create(
+                name=f'Произведение {i}', year=2000, category=category
+            )
+            title.genre.set(genres)
+
+        # Первый запрос загружает справочники категорий и жанров и
+        # кэширует число произведений.
+        client.get(self.TITLES_URL)
+        # Версии каталога (из них же ETag), выборка
+        # произведений, id жанров страницы.
+        with django_assert_num_queries(3):
+            response = client.get(f'{self.TITLES_URL}?limit=100')
+        assert len(response.json()['results']) == 30, (
+            f'Проверьте, что `{self.TITLES_URL}` возвращает все произведения.'
+        )
+
+        title_id = response.json()['results'][0]['id']
+        with django_assert_num_queries(3):
+            client.get(f'{self.TITLES_URL}{title_id}/')
+
+    def test_02_authenticated_user_is_cached(self, user_client, user,
+                                             django_assert_num_queries):
+        url = '/api/v1/users/me/'
+        user_client.get(url)
+        with django_assert_num_queries(0):
+            response = user_client.get(url)
+        assert response.json()['username'] == user.username, (
+            'Проверьте, что пользователь из кэша соответствует токену.'
+        )
+
+        user_client.patch(url, data={'bio': 'Новая биография'})
+        assert user_client.get(url).json()['bio'] == 'Новая биография', (
+            'Проверьте, что кэш пользователя сбрасывается при изменении '
+            'профиля.'
+        )
+
+    def test_03_writes_use_fresh_user(self, admin_client, admin,
+                                      django_user_model):
+        url = '/api/v1/users/me/'
+        admin_client.get(url)
+        # Роль меняет другой процесс: сигнал здесь не сработает.
+        django_user_model.objects.filter(pk=admin.pk).update(role='user')
+        admin_client.patch(url, data={'bio': 'Новая биография'})
+        admin.refresh_from_db()
+        assert admin.role == 'user', (
+            'Проверьте, что изменение профиля не сохраняет устаревшую '
+            'копию пользователя из кэша.'
+        )
+        response = admin_client.post(
+            '/api/v1/users/',
+            data={'username': 'newbie', 'email': 'newbie@yamdb.fake'},
+        )
+        assert response.status_code == 403, (
+            'Проверьте, что права на изменяющие запросы проверяются по '
+            'пользователю из БД.'
+        )
+
+    def test_04_nested_parents_fetched_once(self, admin_client, user_client,
+                                            client,
+                                            django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        user_client.get('/api/v1/users/me/')
+
+        # Пользователь (запись всегда читает его из БД), произведение,
+        # BEGIN, INSERT, счётчики рейтинга и после фиксации UPDATE
+        # версии произведений.
+        with django_assert_num_queries(6):
+            response = user_client.post(
+                reviews_url, data={'text': 'Отзыв', 'score': 5}
+            )
+        duplicate = user_client.post(
+            reviews_url, data={'text': 'Ещё отзыв', 'score': 1}
+        )
+        assert duplicate.json() == {
+            'non_field_errors': [
+                'На произведение можно оставить только один отзыв'
+            ]
+        }, 'Проверьте, что повторный отзыв отклоняется с ошибкой 400.'
+        comments_url = f'{reviews_url}{response.json()["id"]}/comments/'
+        # Родитель, версии для ETag, страница с авторами: count
+        # берётся из счётчика отзывов произведения.
+        with django_assert_num_queries(3):
+            client.get(reviews_url)
+
+        # Пользователь, отзыв, INSERT, UPDATE версии комментариев.
+        with django_assert_num_queries(4):
+            user_client.post(comments_url, data={'text': 'Комментарий'})
+        # Отзыв, версии для ETag, число комментариев, страница.
+        with django_assert_num_queries(4):
+            response = client.get(comments_url)
+        assert response.json()['results'][0]['author'] == 'TestUser'
+
+    def test_05_signup_single_lookup(self, client, django_user_model,
+                                     django_assert_num_queries):
+        url = '/api/v1/auth/signup/'
+        data = {'email': 'signup@yamdb.fake', 'username': 'signup'}
+        client.post(url, data=data)
+        # Поиск пользователя, BEGIN, письмо в очередь.
+        with django_assert_num_queries(3):
+            response = client.post(url, data=data)
+        assert response.status_code == 200
+        assert django_user_model.objects.filter(username='signup').count() == 1
@@ -0,0 +1,43 @@
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10Pagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_reviews_cursor_pagination(self, admin_client, admin,
+                                          user_client, user,
+                                          moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = admin_client.get(url, {'cursor': '', 'limit': 2})
+        data = response.json()
+        assert 'count' not in data and data['next'], (
+            f'Проверьте, что `{url}?cursor=` включает курсорную пагинацию.'
+        )
+        received = [review['id'] for review in data['results']]
+        response = admin_client.get(data['next'])
+        data = response.json()
+        received += [review['id'] for review in data['results']]
+        assert data['next'] is None
+        assert received == sorted(
+            (review['id'] for review in reviews), reverse=True
+        ), (
+            'Проверьте, что курсорная пагинация отдаёт отзывы от новых к '
+            'старым без пропусков и повторов.'
+        )
+
+        response = admin_client.get(url)
+        assert response.json()['count'] == len(reviews), (
+            f'Проверьте, что без параметра cursor `{url}` использует '
+            'пагинацию limit/offset.'
+        )
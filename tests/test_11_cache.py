@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import transaction
+
+from reviews.models import CatalogVersion
+from reviews.models import Genre
+from tests.utils import create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11CatalogCache:
+
+    GENRES_URL = '/api/v1/genres/'
+    CACHE_STATS_URL = '/api/v1/cache-stats/'
+
+    def test_01_catalog_cache_versioning(self, client, admin_client):
+        create_genre(admin_client)
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS'
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{self.GENRES_URL}` '
+            'обслуживается из кэша.'
+        )
+        assert response.json()['count'] == 3
+        assert admin_client.get(self.CACHE_STATS_URL).json() == {
+            'hit': 1,
+            'miss': 1,
+        }, (
+            f'Проверьте, что `{self.CACHE_STATS_URL}` возвращает счётчики '
+            'попаданий и промахов кэша каталога.'
+        )
+
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Вестерн', 'slug': 'western'}
+        )
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что создание жанра инвалидирует кэш списка жанров.'
+        )
+        assert response.json()['count'] == 4
+
+    def test_02_version_bumped_on_commit(self, client, admin_client):
+        create_genre(admin_client)
+        client.get(self.GENRES_URL)
+        with transaction.atomic():
+            Genre.objects.create(name='Вестерн', slug='western')
+            response = client.get(self.GENRES_URL)
+            assert response['X-Cache'] == 'HIT', (
+                'Проверьте, что версия жанров меняется только после '
+                'фиксации транзакции.'
+            )
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 4
+
+    def test_03_version_shared_between_processes(self, client,
+                                                 admin_client):
+        create_genre(admin_client)
+        client.get(self.GENRES_URL)
+        # Смена версии другим процессом видна только через БД.
+        CatalogVersion.objects.filter(resource='genres').update(
+            version='other'
+        )
+        response = client.get(self.GENRES_URL)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что версии каталога хранятся в общей для всех '
+            'процессов таблице.'
+        )
+
+    def test_04_key_includes_scheme_and_host(self, client, admin_client):
+        create_genre(admin_client)
+        url = f'{self.GENRES_URL}?limit=1'
+        client.get(url)
+        response = client.get(url, secure=True)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что ключ кэша ответа строится по абсолютному URL: '
+            'в ответе абсолютные ссылки next и previous.'
+        )
+        assert response.json()['next'].startswith('https://')
+
+    def test_05_cache_stats_only_admin(self, client, user_client):
+        for request_client, expected in (
+            (client, HTTPStatus.UNAUTHORIZED),
+            (user_client, HTTPStatus.FORBIDDEN),
+        ):
+            response = request_client.get(self.CACHE_STATS_URL)
+            assert response.status_code == expected, (
+                f'Проверьте, что `{self.CACHE_STATS_URL}` доступен только '
+                'администратору.'
+            )
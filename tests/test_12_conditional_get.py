@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    create_reviews,
+    create_single_comment,
+    create_single_review,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_reviews_etag(self, admin_client, admin, user_client, user,
+                             moderator_client, client):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = client.get(url)
+        etag = response['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным ETag '
+            'возвращает ответ со статусом 304.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Новый', 7)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после добавления отзыва `{url}` возвращает '
+            'новые данные.'
+        )
+        assert response['ETag'] != etag
+
+    def test_02_title_etag_from_cache(self, admin_client, admin, client):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        etag = client.get(url)['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response['X-Cache'] == 'HIT'
+
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Нуар', 'slug': 'noir'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменения жанров меняют ETag '
+            'произведения.'
+        )
+
+    def test_03_delete_changes_validator(self, admin_client, admin,
+                                         user_client, user, client):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = client.get(url)
+        etag = response['ETag']
+        assert 'Last-Modified' not in response, (
+            'Проверьте, что ответ не содержит Last-Modified: удаление '
+            'отзыва не меняет время последнего изменения выборки.'
+        )
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        response = client.get(
+            url,
+            HTTP_IF_NONE_MATCH=etag,
+            HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT',
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после удаления отзыва, который не был самым '
+            f'новым, `{url}` возвращает новые данные.'
+        )
+        assert response.json()['count'] == 1
+
+    def test_04_edits_change_etag(self, admin_client, admin, client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = client.get(url)['ETag']
+        admin_client.patch(
+            f'{url}{reviews[0]["id"]}/', data={'text': 'Исправленный'}
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение текста отзыва без смены оценки '
+            'меняет ETag списка отзывов.'
+        )
+
+        comments_url = f'{url}{reviews[0]["id"]}/comments/'
+        etag = client.get(comments_url)['ETag']
+        comment = create_single_comment(
+            admin_client, titles[0]['id'], reviews[0]['id'], 'Комментарий'
+        ).json()
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag списка '
+            'комментариев.'
+        )
+        etag = response['ETag']
+        admin_client.delete(f'{comments_url}{comment["id"]}/')
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 0
+
+    def test_05_deleted_review_comments_not_found(self, admin_client, admin,
+                                                  client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        comments_url = f'{url}{reviews[0]["id"]}/comments/'
+        etag = client.get(comments_url)['ETag']
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что после удаления отзыва GET-запрос к списку его '
+            'комментариев со старым ETag возвращает статус 404.'
+        )
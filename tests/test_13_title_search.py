@@ -0,0 +1,61 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_title_full_text_search(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+
+        response = client.get(self.TITLES_URL, {'search': 'yippie'})
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [titles[1]['id']], (
+            f'Проверьте, что `{self.TITLES_URL}?search=` ищет по описанию '
+            'произведения.'
+        )
+
+        response = client.get(self.TITLES_URL, {'search': 'терм'})
+        assert response.json()['count'] == 1, (
+            f'Проверьте, что `{self.TITLES_URL}?search=` ищет по началу '
+            'слова в названии.'
+        )
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        response = client.get(self.TITLES_URL, {'search': 'Терминатор'})
+        assert response.json()['count'] == 0, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        response = client.get(self.TITLES_URL, {'search': 'AND "('})
+        assert response.status_code == 200
+
+    def test_02_fts_triggers_survive_index_migration(self, admin_client,
+                                                     client):
+        # AlterField из reviews 0007 пересоздаёт таблицу reviews_title.
+        call_command('migrate', 'reviews', '0006', verbosity=0)
+        call_command('migrate', 'reviews', verbosity=0)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = 'reviews_title'"
+            )
+            triggers = {row[0] for row in cursor.fetchall()}
+        assert triggers == {
+            'reviews_title_fts_ai',
+            'reviews_title_fts_ad',
+            'reviews_title_fts_au',
+        }, (
+            'Проверьте, что миграция индексов произведений сохраняет '
+            'триггеры поиска в обе стороны.'
+        )
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL, {'search': 'yippie'})
+        assert response.json()['count'] == 1
@@ -0,0 +1,102 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+from roles.management.commands import send_queued_emails
+from roles.models import OutgoingEmail
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14EmailQueue:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_signup_queues_email(self, client):
+        data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+        outbox_before_count = len(mail.outbox)
+        client.post(self.URL_SIGNUP, data=data)
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что `{self.URL_SIGNUP}` не отправляет письмо '
+            'синхронно, а ставит его в очередь.'
+        )
+        assert OutgoingEmail.objects.filter(
+            recipient=data['email'], sent_at__isnull=True
+        ).exists()
+
+        call_command('send_queued_emails', stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 1
+        assert not OutgoingEmail.objects.filter(sent_at__isnull=True).exists()
+
+    def test_02_failed_email_is_retried_later(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_14_email_queue.BrokenBackend'
+        email = OutgoingEmail.objects.create(
+            subject='Тема', body='Текст', recipient='retry@yamdb.fake'
+        )
+        call_command('send_queued_emails', stdout=StringIO())
+        email.refresh_from_db()
+        assert email.sent_at is None and email.attempts == 1, (
+            'Проверьте, что неудачная отправка увеличивает число попыток.'
+        )
+        assert email.next_attempt_at > email.created_at
+        assert 'SMTP недоступен' in email.last_error
+
+    def create_emails(self, count):
+        return OutgoingEmail.objects.bulk_create(
+            OutgoingEmail(
+                subject='Тема', body='Текст', recipient=f'{index}@yamdb.fake'
+            )
+            for index in range(count)
+        )
+
+    def test_03_claimed_batch_is_not_reissued(self):
+        self.create_emails(3)
+        first = send_queued_emails.Command().claim(2)
+        second = send_queued_emails.Command().claim(2)
+        assert len(first) == 2 and len(second) == 1, (
+            'Проверьте, что захваченные письма не выдаются другому '
+            'процессу.'
+        )
+        assert {email.pk for email in first}.isdisjoint(
+            email.pk for email in second
+        )
+        assert send_queued_emails.Command().claim(2) == []
+
+    def test_04_sent_at_saved_per_email(self, settings):
+        settings.EMAIL_BACKEND = 'tests.test_14_email_queue.CrashingBackend'
+        self.create_emails(2)
+        with pytest.raises(KeyboardInterrupt):
+            call_command('send_queued_emails', stdout=StringIO())
+        sent = OutgoingEmail.objects.filter(sent_at__isnull=False)
+        assert sent.count() == 1, (
+            'Проверьте, что время отправки сохраняется сразу после '
+            'отправки письма, а не в конце пачки.'
+        )
+
+
+class BrokenBackend:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def open(self):
+        raise ConnectionError('SMTP недоступен')
+
+    def close(self):
+        pass
+
+
+class CrashingBackend(BrokenBackend):
+    """Процесс падает на втором письме пачки."""
+
+    def __init__(self, *args, **kwargs):
+        self.sent = 0
+
+    def open(self):
+        pass
+
+    def send_messages(self, messages):
+        self.sent += 1
+        if self.sent > 1:
+            raise KeyboardInterrupt
+        return len(messages)
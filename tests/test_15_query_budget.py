@@ -0,0 +1,54 @@
+import pytest
+
+from api.middleware import QueryBudgetExceeded
+from api.views import TitleViewSet
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15QueryBudget:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_query_headers(self, client):
+        response = client.get(self.TITLES_URL)
+        assert int(response['X-DB-Queries']) > 0, (
+            'Проверьте, что ответ содержит число SQL-запросов в заголовке '
+            '`X-DB-Queries`.'
+        )
+        assert float(response['X-DB-Time-Ms']) >= 0
+
+    def test_02_budget_exceeded(self, client, settings, monkeypatch):
+        settings.QUERY_BUDGET_RAISE = True
+        monkeypatch.setattr(TitleViewSet, 'query_budget', 1)
+        with pytest.raises(QueryBudgetExceeded):
+            client.get(self.TITLES_URL)
+
+    def test_03_disabled(self, client, settings):
+        settings.QUERY_BUDGET_ENABLED = False
+        response = client.get(self.TITLES_URL)
+        assert 'X-DB-Queries' not in response, (
+            'Проверьте, что при QUERY_BUDGET_ENABLED = False middleware '
+            'не подключается.'
+        )
+
+    def test_04_action_budget(self, admin_client, settings, monkeypatch):
+        _, categories, genres = create_titles(admin_client)
+        settings.QUERY_BUDGET_RAISE = True
+        monkeypatch.setattr(TitleViewSet, 'query_budget', 1)
+        items = [
+            {
+                'name': f'Пачка {index}',
+                'year': 2000,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+            }
+            for index in range(5)
+        ]
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', data=items, format='json'
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что query_budget=None в @action отключает бюджет '
+            'вьюсета для этого действия.'
+        )
@@ -0,0 +1,69 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Profiler:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def profiler(self, settings, tmp_path):
+        settings.PROFILER_ENABLED = True
+        settings.PROFILER_SAMPLE_RATE = 0
+        settings.PROFILER_DIR = tmp_path
+        return tmp_path
+
+    def test_01_sample_rate(self, client, profiler, settings):
+        settings.PROFILER_SAMPLE_RATE = 2
+        for _ in range(4):
+            client.get(self.TITLES_URL)
+        files = list((profiler / 'TitleViewSet.list').glob('*.prof'))
+        assert len(files) == 2, (
+            'Проверьте, что профилируется каждый PROFILER_SAMPLE_RATE-й '
+            'запрос и профиль сохраняется в папку представления.'
+        )
+
+    def test_02_admin_header(self, client, admin_client, profiler):
+        client.get(self.TITLES_URL, HTTP_X_PROFILE='1')
+        assert not list(profiler.glob('*/*.prof')), (
+            'Проверьте, что заголовок X-Profile учитывается только для '
+            'администратора.'
+        )
+        admin_client.get(self.TITLES_URL, HTTP_X_PROFILE='1')
+        assert list(profiler.glob('TitleViewSet.list/*.prof')), (
+            'Проверьте, что запрос администратора с заголовком X-Profile '
+            'профилируется.'
+        )
+
+    def test_03_rotation(self, client, profiler, settings):
+        settings.PROFILER_SAMPLE_RATE = 1
+        settings.PROFILER_MAX_FILES = 3
+        for _ in range(5):
+            client.get(self.TITLES_URL)
+        files = list((profiler / 'TitleViewSet.list').glob('*.prof'))
+        assert len(files) == 3, (
+            'Проверьте, что в папке представления остаётся не больше '
+            'PROFILER_MAX_FILES последних профилей.'
+        )
+
+    def test_04_report(self, client, profiler, settings):
+        settings.PROFILER_SAMPLE_RATE = 1
+        client.get(self.TITLES_URL)
+        out = StringIO()
+        call_command(
+            'profile_report',
+            dir=str(profiler),
+            sort='cumtime',
+            limit=100,
+            stdout=out,
+        )
+        report = out.getvalue()
+        assert 'TitleViewSet.list: 1 запросов' in report, (
+            'Проверьте, что profile_report выводит отчёт по представлению.'
+        )
+        assert 'api/mixins.py' in report, (
+            'Проверьте, что в отчёт попадают функции проекта.'
+        )
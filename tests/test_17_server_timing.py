@@ -0,0 +1,56 @@
+import pytest
+
+from api.timing import PHASES
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ServerTiming:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_viewset_phases(self, admin_client):
+        response = admin_client.get(self.TITLES_URL)
+        assert 'Server-Timing' in response, (
+            'Проверьте, что ответ API содержит заголовок `Server-Timing`.'
+        )
+        metrics = parse_server_timing(response['Server-Timing'])
+        assert tuple(metrics) == PHASES, (
+            'Проверьте, что `Server-Timing` содержит фазы auth, perm, db, '
+            'serializer, render и total.'
+        )
+        durations = {
+            name: float(params['dur']) for name, params in metrics.items()
+        }
+        for name in ('auth', 'perm', 'db', 'render'):
+            assert durations[name] > 0, (
+                f'Проверьте, что время фазы {name} замеряется.'
+            )
+        assert metrics['db']['desc'].endswith('queries"')
+        assert durations['total'] >= max(durations.values())
+
+    def test_02_function_view(self, client):
+        response = client.post(
+            '/api/v1/auth/signup/',
+            data={'username': 'timing', 'email': 'timing@yamdb.fake'},
+        )
+        metrics = parse_server_timing(response['Server-Timing'])
+        assert float(metrics['serializer']['dur']) > 0, (
+            'Проверьте, что в функции signup замеряется время сериализатора.'
+        )
+        assert float(metrics['auth']['dur']) > 0
+
+    def test_03_disabled(self, client, settings):
+        settings.SERVER_TIMING_ENABLED = False
+        response = client.get(self.TITLES_URL)
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что при SERVER_TIMING_ENABLED = False заголовок '
+            'не добавляется.'
+        )
@@ -0,0 +1,36 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.serializers import TitleSerializer, TitleValuesSerializer
+from api.views import TitleViewSet
+from reviews.models import Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18TitleValues:
+
+    def test_01_same_output_as_serializer(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        Title.objects.create(name='Без категории', year=2000)
+        queryset = TitleViewSet.queryset.order_by('pk')
+        expected = JSONRenderer().render(
+            TitleSerializer(queryset, many=True).data
+        )
+        rows = list(TitleValuesSerializer.get_values(queryset))
+        assert JSONRenderer().render(
+            TitleValuesSerializer(rows).data
+        ) == expected, (
+            'Проверьте, что TitleValuesSerializer выдаёт те же данные, '
+            'что и TitleSerializer.'
+        )
+
+    def test_02_detail(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title = TitleViewSet.queryset.get(pk=titles[0]['id'])
+        response = admin_client.get(f'/api/v1/titles/{title.pk}/')
+        assert response.content == JSONRenderer().render(
+            TitleSerializer(title).data
+        ), 'Проверьте, что ответ на GET-запрос произведения не изменился.'
+        assert admin_client.get('/api/v1/titles/999/').status_code == 404
@@ -0,0 +1,68 @@
+import pytest
+
+from api.pagination import EstimatedCountPagination
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19EstimatedCount:
+
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_unfiltered_count_estimate(self, admin_client, client):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == 2
+        assert response['X-Count-Source'] == 'estimate', (
+            f'Проверьте, что без фильтров `{self.TITLES_URL}` берёт count '
+            'из кэша, а не из SELECT COUNT(*).'
+        )
+
+        # bulk_create не отправляет сигналы: закэшированное число
+        # остаётся прежним до следующей записи через API.
+        Title.objects.bulk_create([Title(name='Чужой', year=1979)])
+        response = client.get(self.TITLES_URL, {'limit': 5})
+        assert response.json()['count'] == 2
+        response = client.get(self.TITLES_URL, {'count': 'exact'})
+        assert response.json()['count'] == 3, (
+            f'Проверьте, что `{self.TITLES_URL}?count=exact` считает '
+            'строки точно.'
+        )
+        assert response['X-Count-Source'] == 'exact'
+
+    def test_02_filtered_count(self, admin_client, client, monkeypatch):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL, {'year': 1984})
+        assert response.json()['count'] == 1
+        assert response['X-Count-Source'] == 'exact', (
+            'Проверьте, что небольшая отфильтрованная выборка считается '
+            'точно.'
+        )
+
+        Title.objects.bulk_create(
+            [Title(name='Чужой', year=1984), Title(name='Дюна', year=1984)]
+        )
+        monkeypatch.setattr(EstimatedCountPagination, 'exact_count_limit', 0)
+        response = client.get(self.TITLES_URL, {'year': 1984, 'limit': 1})
+        data = response.json()
+        assert response['X-Count-Source'] == 'lower-bound', (
+            'Проверьте, что подсчёт отфильтрованной выборки ограничен '
+            '`exact_count_limit` строками после страницы.'
+        )
+        assert data['count'] == 2 and data['next']
+
+    def test_03_users_count_invalidation(self, admin_client):
+        response = admin_client.get(self.USERS_URL)
+        count = response.json()['count']
+        assert response['X-Count-Source'] == 'estimate'
+        admin_client.post(
+            self.USERS_URL,
+            data={'username': 'counted', 'email': 'counted@yamdb.fake'},
+        )
+        response = admin_client.get(self.USERS_URL)
+        assert response.json()['count'] == count + 1, (
+            'Проверьте, что создание пользователя обновляет закэшированное '
+            f'число строк `{self.USERS_URL}`.'
+        )
@@ -0,0 +1,57 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from api.management.commands import explain_queries
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ExplainQueries:
+
+    @pytest.fixture
+    def comments(self, admin_client, admin, user_client, user):
+        return create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+
+    def test_01_filters_use_indexes(self, comments):
+        out = StringIO()
+        call_command(
+            'explain_queries', fail_on_scan=True, stdout=out, stderr=out
+        )
+        report = out.getvalue()
+        for label in ('titles-filter-year', 'titles-filter-name',
+                      'comments-list'):
+            assert label in report, (
+                f'Проверьте, что explain_queries разбирает сценарий {label}.'
+            )
+        assert 'Полный просмотр' not in report, (
+            'Проверьте, что фильтры и вложенные списки используют индексы.'
+        )
+
+    def test_02_full_scan_reported(self, comments, monkeypatch):
+        monkeypatch.setattr(
+            explain_queries,
+            'FILTER_SCENARIOS',
+            (
+                (
+                    'titles-filter-description',
+                    'get',
+                    'title-list',
+                    (),
+                    'description=x',
+                    None,
+                    explain_queries.ROLES,
+                ),
+            ),
+        )
+        with pytest.raises(CommandError, match='titles-filter-description'):
+            call_command(
+                'explain_queries',
+                fail_on_scan=True,
+                only=['titles-filter-description'],
+                stdout=StringIO(),
+            )
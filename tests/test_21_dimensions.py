@@ -0,0 +1,100 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api import dimensions
+from reviews.models import Genre, Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Dimensions:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def test_01_title_paths_skip_dimension_tables(self, admin_client,
+                                                  client):
+        _, categories, genres = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        with CaptureQueriesContext(connection) as queries:
+            client.get(self.TITLES_URL, {'genre': genres[0]['slug']})
+            client.get(self.TITLES_URL, {'category': categories[0]['slug']})
+            response = admin_client.post(
+                self.TITLES_URL,
+                data={
+                    'name': 'Чужой',
+                    'year': 1979,
+                    'genre': [genres[0]['slug']],
+                    'category': categories[0]['slug'],
+                },
+            )
+        assert response.status_code == 201
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        assert '"reviews_genre"."slug" =' not in sql, (
+            'Проверьте, что фильтр и создание произведения берут жанры из '
+            'справочника в памяти процесса.'
+        )
+        assert '"reviews_category"."slug" =' not in sql, (
+            'Проверьте, что фильтр и создание произведения берут категории '
+            'из справочника в памяти процесса.'
+        )
+
+    def test_02_snapshot_refreshed_on_write(self, admin_client):
+        _, categories, _ = create_titles(admin_client)
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Вестерн', 'slug': 'western'}
+        )
+        response = admin_client.post(
+            self.TITLES_URL,
+            data={
+                'name': 'Хороший, плохой, злой',
+                'year': 1966,
+                'genre': ['western'],
+                'category': categories[0]['slug'],
+            },
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что справочник жанров перечитывается после '
+            'создания жанра.'
+        )
+        response = admin_client.get(self.TITLES_URL, {'genre': 'western'})
+        assert response.json()['results'][0]['genre'] == [
+            {'name': 'Вестерн', 'slug': 'western'}
+        ]
+
+    def test_03_snapshot_in_transaction_not_kept(self, admin_client):
+        create_titles(admin_client)
+        dimensions.genres.get_snapshot()
+        with transaction.atomic():
+            Genre.objects.create(name='Нуар', slug='noir')
+            assert dimensions.genres.get_pk('noir')
+            transaction.set_rollback(True)
+        assert dimensions.genres.get_snapshot().get_pk('noir') is None, (
+            'Проверьте, что снимок справочника, прочитанный в откатившейся '
+            'транзакции, не сохраняется.'
+        )
+
+    def test_04_stale_snapshot_falls_back_to_db(self, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        # Жанр записан без сигналов, как другим процессом, чья новая
+        # версия ещё не видна: в снимке справочника его нет.
+        Genre.objects.bulk_create([Genre(name='Нуар', slug='noir')])
+        genre = Genre.objects.get(slug='noir')
+        title = Title.objects.get(pk=titles[0]['id'])
+        title.genre.through.objects.bulk_create(
+            [title.genre.through(title=title, genre=genre)]
+        )
+        title.save()
+
+        response = client.get(f'{self.TITLES_URL}{title.pk}/')
+        assert {'name': 'Нуар', 'slug': 'noir'} in response.json()['genre'], (
+            'Проверьте, что жанр, которого нет в снимке справочника, '
+            'читается из БД.'
+        )
+        response = client.get(self.TITLES_URL, {'genre': 'noir'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что фильтр по жанру, которого нет в снимке '
+            'справочника, ищет жанр в БД.'
+        )
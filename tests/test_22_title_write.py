@@ -0,0 +1,62 @@
+import pytest
+
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitleWrite:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_create_without_reads(self, admin_client,
+                                     django_assert_num_queries):
+        _, categories, genres = create_titles(admin_client)
+        data = {
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[1]['slug'], genres[0]['slug']],
+            'category': categories[0]['slug'],
+        }
+        # Пользователь, версии каталога, BEGIN, INSERT произведения, один
+        # INSERT связей с жанрами, UPDATE версии произведений.
+        with django_assert_num_queries(6):
+            response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == 201
+        title_url = f'{self.TITLES_URL}{response.json()["id"]}/'
+        assert response.json() == admin_client.get(title_url).json(), (
+            'Проверьте, что ответ на создание произведения совпадает с '
+            'ответом на GET-запрос к нему.'
+        )
+
+        data['genre'] = [genres[0]['slug'], 'unknown']
+        response = admin_client.post(self.TITLES_URL, data=data)
+        assert response.status_code == 400
+        assert 'genre' in response.json(), (
+            'Проверьте, что несуществующий slug жанра отклоняется.'
+        )
+
+    def test_02_update_genres_by_difference(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        title = Title.objects.get(pk=titles[0]['id'])
+        kept = title.genre.through.objects.get(
+            title=title, genre__slug=genres[0]['slug']
+        )
+        title_url = f'{self.TITLES_URL}{title.pk}/'
+        response = admin_client.patch(
+            title_url, data={'genre': [genres[0]['slug'], genres[2]['slug']]}
+        )
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            genres[0]['slug'],
+            genres[2]['slug'],
+        ]
+        assert response.json() == admin_client.get(title_url).json()
+        assert title.genre.through.objects.filter(pk=kept.pk).exists(), (
+            'Проверьте, что при изменении жанров произведения оставшиеся '
+            'связи не удаляются и не создаются заново.'
+        )
+
+        response = admin_client.patch(title_url, data={'name': 'Терминатор 2'})
+        assert len(response.json()['genre']) == 2, (
+            'Проверьте, что PATCH без жанров не меняет жанры произведения.'
+        )
@@ -0,0 +1,133 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TitleBulk:
+
+    TITLES_URL = '/api/v1/titles/'
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def get_items(self, categories, genres, count):
+        return [
+            {
+                'name': f'Пачка {index}',
+                'year': 2000 + index % 20,
+                'description': f'Описание {index}',
+                'genre': [genres[index % 3]['slug'], genres[2]['slug']],
+                'category': categories[index % 2]['slug'],
+            }
+            for index in range(count)
+        ]
+
+    def test_01_bulk_create(self, admin_client,
+                            django_assert_max_num_queries):
+        _, categories, genres = create_titles(admin_client)
+        count = admin_client.get(self.TITLES_URL).json()['count']
+        items = self.get_items(categories, genres, 50)
+        # Число запросов не зависит от размера пачки: произведения и
+        # связи с жанрами вставляются многострочными INSERT.
+        with django_assert_max_num_queries(6):
+            response = admin_client.post(
+                self.BULK_URL, data=items, format='json'
+            )
+        assert response.status_code == 201, (
+            'Проверьте, что POST-запрос администратора к `/api/v1/titles/'
+            'bulk/` с корректными данными возвращает статус 201.'
+        )
+        data = response.json()
+        assert data['created'] == 50 and data['failed'] == 0
+        for item, result in zip(items, data['results']):
+            title = admin_client.get(f'{self.TITLES_URL}{result["id"]}/')
+            title = title.json()
+            assert title['name'] == item['name'], (
+                'Проверьте, что id в результатах идут в порядке элементов '
+                'запроса.'
+            )
+            assert sorted(genre['slug'] for genre in title['genre']) == (
+                sorted(set(item['genre']))
+            ), 'Проверьте, что пачка создаёт связи произведений с жанрами.'
+            assert title['category']['slug'] == item['category']
+
+        response = admin_client.get(self.TITLES_URL)
+        assert response.json()['count'] == count + 50, (
+            'Проверьте, что после создания пачки кэш списка произведений '
+            'сбрасывается.'
+        )
+        response = admin_client.get(self.TITLES_URL, {'search': 'Пачка 49'})
+        assert response.json()['count'] == 1, (
+            'Проверьте, что произведения из пачки попадают в индекс поиска.'
+        )
+
+    def test_02_bulk_item_errors(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        valid = self.get_items(categories, genres, 1)[0]
+        items = [
+            {'name': 'Без полей'},
+            5,
+            dict(valid, year=3000),
+            dict(valid, genre=['unknown']),
+            valid,
+        ]
+        response = admin_client.post(self.BULK_URL, data=items, format='json')
+        assert response.status_code == 207, (
+            'Проверьте, что пачка, созданная частично, возвращает статус 207.'
+        )
+        data = response.json()
+        assert data['created'] == 1 and data['failed'] == 4
+        errors = [result.get('errors', {}) for result in data['results']]
+        assert set(errors[0]) == {'year'}, (
+            'Проверьте, что элементы пачки проверяются так же, как при '
+            'добавлении одного произведения.'
+        )
+        assert 'non_field_errors' in errors[1]
+        assert 'year' in errors[2]
+        assert 'genre' in errors[3]
+        assert 'id' in data['results'][4], (
+            'Проверьте, что для корректного элемента возвращается id.'
+        )
+
+        response = admin_client.post(
+            self.BULK_URL, data=items[:4], format='json'
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что пачка без корректных элементов возвращает '
+            'статус 400.'
+        )
+        response = admin_client.post(self.BULK_URL, data={}, format='json')
+        assert response.status_code == 400
+
+    def test_03_bulk_only_admin(self, admin_client, user_client, client):
+        _, categories, genres = create_titles(admin_client)
+        items = self.get_items(categories, genres, 2)
+        response = user_client.post(self.BULK_URL, data=items, format='json')
+        assert response.status_code == 403, (
+            'Проверьте, что пачку произведений может создать только '
+            'администратор.'
+        )
+        response = client.post(
+            self.BULK_URL, data=items, content_type='application/json'
+        )
+        assert response.status_code == 401
+
+    def test_04_same_rules_as_single_post(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        valid = self.get_items(categories, genres, 1)[0]
+        items = [
+            {'name': 'Без жанров', 'year': 2000},
+            dict(valid, year=3000),
+            dict(valid, name='н' * 257),
+        ]
+        response = admin_client.post(self.BULK_URL, data=items, format='json')
+        results = response.json()['results']
+        for item, result in zip(items, results):
+            single = admin_client.post(
+                self.TITLES_URL, data=item, format='json'
+            )
+            assert ('id' in result) == (single.status_code == 201), (
+                'Проверьте, что пачка принимает те же элементы, что и '
+                f'одиночный POST-запрос к `{self.TITLES_URL}`.'
+            )
+            if 'errors' in result:
+                assert result['errors'] == single.json()
@@ -0,0 +1,58 @@
+import random
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.management.commands import generate_dataset
+from reviews.models import Comment, Review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24GenerateDataset:
+
+    def test_01_exact_totals(self):
+        call_command(
+            'generate_dataset',
+            users=100,
+            categories=2,
+            genres=5,
+            titles=20,
+            reviews=300,
+            comments=1000,
+            stdout=StringIO(),
+        )
+        assert Review.objects.count() == 300
+        assert Comment.objects.count() == 1000, (
+            'Проверьте, что generate_dataset создаёт ровно --comments '
+            'комментариев.'
+        )
+
+    def test_02_reviews_shortfall_reported(self):
+        out = StringIO()
+        call_command(
+            'generate_dataset',
+            users=5,
+            titles=2,
+            reviews=50,
+            comments=10,
+            stdout=out,
+        )
+        assert Review.objects.count() == 10
+        assert 'будет создано 10 из 50' in out.getvalue(), (
+            'Проверьте, что generate_dataset сообщает, сколько отзывов '
+            'не удалось создать.'
+        )
+        assert Comment.objects.count() == 10
+
+    def test_03_comment_counts_streamed(self):
+        command = generate_dataset.Command()
+        command.rng = random.Random(0)
+        counts = command.exponential_counts(1000, 100000)
+        assert not isinstance(counts, list), (
+            'Проверьте, что число комментариев на отзыв выдаётся потоком, '
+            'без списков длиной в число отзывов.'
+        )
+        counts = list(counts)
+        assert len(counts) == 100000
+        assert sum(counts) == 1000 and min(counts) >= 0
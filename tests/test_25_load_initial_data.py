@@ -0,0 +1,115 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count, Sum
+
+from reviews.management.commands import load_initial_data
+from reviews.management.commands.load_initial_data import (
+    DATA_SOURCES,
+    DEFAULT_USER_PASSWORD,
+    GENRE_TITLE_FILE,
+    STATIC_DIR,
+    USER_FILE,
+)
+from reviews.models import Category, Review, Title
+
+User = get_user_model()
+
+
+def read_rows(file_name):
+    with open(STATIC_DIR.joinpath(file_name), encoding='utf8') as file:
+        return list(csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25LoadInitialData:
+
+    def load(self, **options):
+        call_command('load_initial_data', stdout=StringIO(), **options)
+
+    def test_01_row_counts(self):
+        # Повторная загрузка заменяет данные, а не дописывает их.
+        self.load()
+        self.load()
+        for model, file_name in DATA_SOURCES.items():
+            assert model.objects.count() == len(read_rows(file_name)), (
+                f'Проверьте, что load_initial_data загружает все строки '
+                f'{file_name}.'
+            )
+        assert User.objects.count() == len(read_rows(USER_FILE))
+
+    def test_02_failed_file_keeps_rows(self, monkeypatch):
+        self.load()
+        read_batches = load_initial_data.Command.read_batches
+
+        def broken_read_batches(command, file_name, mapping=None):
+            if file_name == DATA_SOURCES[Category]:
+                raise ValueError(file_name)
+            return read_batches(command, file_name, mapping)
+
+        monkeypatch.setattr(
+            load_initial_data.Command, 'read_batches', broken_read_batches
+        )
+        with pytest.raises(ValueError):
+            self.load()
+        assert Category.objects.count() == len(
+            read_rows(DATA_SOURCES[Category])
+        ), (
+            'Проверьте, что старые строки удаляются в одной транзакции '
+            'с загрузкой файла.'
+        )
+
+    def test_03_genre_links(self):
+        self.load()
+        expected = {
+            (int(row['title_id']), int(row['genre_id']))
+            for row in read_rows(GENRE_TITLE_FILE)
+        }
+        links = set(
+            Title.genre.through.objects.values_list('title_id', 'genre_id')
+        )
+        assert links == expected, (
+            'Проверьте, что load_initial_data связывает произведения с '
+            'жанрами из genre_title.csv.'
+        )
+
+    def test_04_title_counters(self):
+        self.load()
+        expected = {
+            row['title_id']: (row['count'], row['total'])
+            for row in Review.objects.values('title_id').annotate(
+                count=Count('id'), total=Sum('score')
+            )
+        }
+        for title in Title.objects.all():
+            assert (title.review_count, title.score_sum) == expected.get(
+                title.pk, (0, 0)
+            ), (
+                'Проверьте, что после импорта счётчики отзывов '
+                'произведений пересчитаны.'
+            )
+
+    @pytest.mark.parametrize(
+        'mode,usable', (('shared', True), ('unusable', False),
+                        ('per-user', True))
+    )
+    def test_05_password_modes(self, mode, usable):
+        self.load(passwords=mode)
+        users = list(User.objects.all())
+        for user in users:
+            assert user.has_usable_password() is usable
+            if usable:
+                assert user.check_password(DEFAULT_USER_PASSWORD), (
+                    f'Проверьте пароль пользователей в режиме {mode}.'
+                )
+        hashes = {user.password for user in users}
+        if mode == 'per-user':
+            assert len(hashes) == len(users), (
+                'Проверьте, что в режиме per-user у каждого пользователя '
+                'свой хэш пароля.'
+            )
+        else:
+            assert len(hashes) == 1